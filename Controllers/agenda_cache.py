@@ -0,0 +1,73 @@
+import threading
+from collections import OrderedDict
+
+from Models.task import Task
+
+
+class AgendaCache:
+    # read-through cache of task listings keyed by (user_id, TaskFilter)
+    max_entries: int
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self.__entries: OrderedDict[tuple, list[Task]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # bumped by every invalidation, see put()
+        self.generation = 0
+        # listings are read and invalidated from the GUI and worker threads
+        self.__lock = threading.Lock()
+
+    def get(self, key: tuple) -> list[Task] | None:
+        with self.__lock:
+            tasks = self.__entries.get(key)
+            if tasks is None:
+                self.misses += 1
+                return None
+
+            # most recently used entries live at the end
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return list(tasks)
+
+    def put(self, key: tuple, tasks: list[Task], generation: int | None = None):
+        # generation is self.generation from before the query, a listing read while
+        # another thread changed tasks is not stored
+        with self.__lock:
+            if generation is not None and generation != self.generation:
+                return
+
+            self.__entries[key] = list(tasks)
+            self.__entries.move_to_end(key)
+
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_day(self, user_id: int, day: str | None):
+        # drop every listing of the user whose filter covers day ('YYYY-MM-DD', None if unknown)
+        with self.__lock:
+            self.generation += 1
+            for key in [key for key in self.__entries if key[0] == user_id and key[1].includes_day(day)]:
+                del self.__entries[key]
+
+    def clear(self):
+        with self.__lock:
+            self.generation += 1
+            self.__entries.clear()
+
+    def stats(self) -> dict:
+        with self.__lock:
+            size = len(self.__entries)
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': size,
+            'max_entries': self.max_entries
+        }
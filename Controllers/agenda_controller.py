@@ -1,25 +1,52 @@
-from datetime import datetime, timedelta
+import sqlite3
+from collections.abc import Iterable
+from datetime import date as date_type, datetime
 from Models.task import Task
+from Controllers.agenda_cache import AgendaCache
 from Controllers.context_manager import ContextManager
+from Controllers.task_filter import TaskFilter
+from Controllers import queries, recurrence
 
 
 class AgendaController:
     tasks: list
     user_id: int
     user_id: int
-    def __init__(self, user_id: int):
+    # max ids bound in one IN (...) lookup
+    BATCH_SIZE: int = 500
+    # newest full-text matches of the user ranked by search_tasks, older ones are left out for very common words
+    SEARCH_CANDIDATES: int = 2000
+
+    def __init__(self, user_id: int, db: ContextManager | None = None, cache: AgendaCache | None = None):
         self.user_id = user_id
-        self.db = ContextManager()
+        self.db = db or ContextManager.shared()
+        self.cache = cache or AgendaCache()
 
+    def add_task(
+        self,
+        name: str,
+        description: str,
+        date: datetime = datetime.now(),
+        priority: str = 1,
+        status: str = "Pending",
+        rrule: str | None = None
+    ) -> Task | dict:
+        # a recurring series is stored once, date is the start of its first occurrence
+        recurrence_end = None
+        if rrule:
+            try:
+                rrule, recurrence_end = self.__series_fields(rrule, date)
+            except ValueError as e:
+                return {
+                    'success': False,
+                    'message': str(e)
+                }
 
-    def add_task(self, name: str, description: str, date: datetime = datetime.now(), priority: str = 1, status: str = "Pending") -> Task | dict:
         # create new task in database
         identifier = self.db.execute(
-            """
-            INSERT INTO tasks (name, description, date, priority, status, user_id)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (name, description, date, priority, status, self.user_id)
+            queries.INSERT_TASK.sql,
+            (name, description, date, priority, Task.priority_rank(priority), status, self.user_id, rrule or None, recurrence_end),
+            queries.INSERT_TASK.fetch_mode
         )
 
         if not identifier:
@@ -29,18 +56,21 @@ class AgendaController:
                 'message': 'Something went wrong! Task could\'t be created'
             }
 
+        # occurrences of a series can fall on any day
+        self.__invalidate(None if rrule else date)
+
         # create new Task Instance and return it
         return {
             'success': True,
-            'task': Task(name, description, date, priority, status, identifier=identifier)
+            'task': Task(name, description, date, priority, status, identifier=identifier, rrule=rrule or None)
         }
 
     def get_task(self, task_id):
         # search for task in database
         raw_task = self.db.execute(
-            "SELECT name, description, date, priority, status, id FROM tasks WHERE id = ? and user_id = ?",
+            queries.SELECT_TASK.sql,
             (task_id, self.user_id),
-            fetch_mode = 'one'
+            queries.SELECT_TASK.fetch_mode
         )
 
         # check if task was found
@@ -53,65 +83,315 @@ class AgendaController:
         # create Task instance and return it
         return {
             'success': True,
-            'task': Task(*raw_task[:5], identifier=raw_task[5])
+            'task': Task(*raw_task[:5], identifier=raw_task[5], rrule=raw_task[6])
         }
 
     def get_tasks(self, date: str|None = None, active_tasks = False) -> dict:
-        # Base query
-        query = """
-            SELECT name, description, date, priority, status, id
-            FROM tasks
-            WHERE user_id = ?
+        # a day ('YYYY-MM-DD') or every date, optionally only active statuses
+        statuses = TaskFilter.ACTIVE_STATUSES if active_tasks else None
+        if date:
+            return self.find_tasks(TaskFilter.for_day(date, statuses=statuses))
+        return self.find_tasks(TaskFilter(statuses=statuses))
+
+    def find_tasks(self, task_filter: TaskFilter) -> dict:
+        cache_key = (self.user_id, task_filter)
+        tasks = self.cache.get(cache_key)
+
+        if tasks is None:
+            generation = self.cache.generation
+            tasks = self.__query_tasks(task_filter)
+            if tasks is False:
+                return {
+                    'success': False,
+                    'message': 'Something went wrong!'
+                }
+            self.cache.put(cache_key, tasks, generation)
+
+        # return the Task instances, an empty list for a day without tasks
+        return {
+            'success': True,
+            'tasks': tasks
+        }
+
+    def due_tasks(self, start: datetime, end: datetime) -> dict:
+        # open tasks and occurrences due in [start, end), read past the cache since every window is asked for once
+        tasks = self.__query_tasks(TaskFilter(statuses=TaskFilter.ACTIVE_STATUSES, start=start, end=end))
+        if tasks is False:
+            return {
+                'success': False,
+                'message': 'Something went wrong!'
+            }
+
+        return {
+            'success': True,
+            'tasks': tasks
+        }
+
+    def search_tasks(self, query: str, limit: int = 50) -> dict:
+        """
+        Full-text search over task names and descriptions, best matches first.
+
+        :param query: words as typed by the user, each word matches as a prefix
+        :param limit: max tasks returned, the best of the newest SEARCH_CANDIDATES matches
+        :return: dict with the matching tasks, empty when nothing matches
         """
+        expression = self.match_expression(query)
+        if expression is None:
+            return {
+                'success': True,
+                'tasks': []
+            }
 
-        if active_tasks:
-            query += "AND status in ('Pending', 'In Progress', 'On Hold')"
+        statement = queries.SEARCH_TASKS
+        raw_tasks = self.db.execute(
+            statement.sql,
+            (expression, self.user_id, self.SEARCH_CANDIDATES, limit),
+            statement.fetch_mode
+        )
+        if raw_tasks is False:
+            return {
+                'success': False,
+                'message': 'Something went wrong!'
+            }
 
-        params = [self.user_id]
+        return {
+            'success': True,
+            'tasks': [Task(*raw_task[:5], identifier=raw_task[5], rrule=raw_task[6]) for raw_task in raw_tasks]
+        }
 
-        # Add condition for filtering by date if 'date' is provided
-        if date:
-            # Convert the input date from 'd-m-Y' format to 'YYYY-MM-DD'
-            formatted_date = datetime.strptime(date, "%Y-%m-%d").strftime("%Y-%m-%d")
-            query += " AND DATE(date) = ?"
-            params.append(formatted_date)
-
-        # Append sorting logic
-        query += """
-            ORDER BY CASE priority
-                WHEN 'Critical' THEN 1
-                WHEN 'High' THEN 2
-                WHEN 'Medium' THEN 3
-                WHEN 'Low' THEN 4
-                ELSE 5
-            END;
+    @staticmethod
+    def match_expression(query: str) -> str | None:
+        # the same word prefixes as a TaskFilter text
+        return TaskFilter.match_expression(query)
+
+    def day_counts(self, start: date_type | str, end: date_type | str) -> dict:
+        """
+        Number of tasks per day in [start, end), split by status and priority.
+
+        :param start: first day, a date or 'YYYY-MM-DD'
+        :param end: day after the last one, a date or 'YYYY-MM-DD'
+        :return: dict with days mapping 'YYYY-MM-DD' to total, statuses and priorities counts
+            and open (active status) counts, days without tasks are left out
+        """
+        start, end = (day if isinstance(day, str) else day.strftime("%Y-%m-%d") for day in (start, end))
+
+        # the summary table holds single tasks, occurrences of series are expanded for the range
+        statement = queries.DAY_COUNTS
+        rows = self.db.execute(statement.sql, (self.user_id, start, end), statement.fetch_mode)
+        occurrences = self.__occurrences(TaskFilter(start=datetime.fromisoformat(start), end=datetime.fromisoformat(end)))
+        if rows is False or occurrences is False:
+            return {
+                'success': False,
+                'message': 'Something went wrong!'
+            }
+
+        rows = [
+            *rows,
+            *((self.__day_of(task.get_datetime()), task.status, task.priority, 1) for task in occurrences)
+        ]
+
+        days = {}
+        for day, status, priority, count in rows:
+            counts = days.setdefault(day, {'total': 0, 'statuses': {}, 'priorities': {}, 'open': 0, 'open_priorities': {}})
+            counts['total'] += count
+            counts['statuses'][status] = counts['statuses'].get(status, 0) + count
+            counts['priorities'][priority] = counts['priorities'].get(priority, 0) + count
+
+            if status in TaskFilter.ACTIVE_STATUSES:
+                counts['open'] += count
+                counts['open_priorities'][priority] = counts['open_priorities'].get(priority, 0) + count
+
+        return {
+            'success': True,
+            'days': days
+        }
+
+    def get_tasks_page(self, task_filter: TaskFilter | None = None, after: tuple | None = None, limit: int = 100) -> dict:
+        """
+        Fetch one page of tasks ordered by priority rank, date and id.
+
+        :param task_filter: tasks to list, None for all tasks of the user
+        :param after: cursor returned with the previous page, None for the first page
+        :param limit: max tasks in the page
+        :return: dict with tasks, the cursor of the next page and whether more pages exist
+        """
+        conditions, params = (task_filter or TaskFilter()).conditions()
+        if after is None:
+            statement = queries.filtered_statement('page', conditions)
+            params = (self.user_id, *params, limit + 1)
+        else:
+            statement = queries.filtered_statement('page_after', conditions)
+            params = (self.user_id, *after, *params, limit + 1)
+
+        # one extra row tells if another page follows
+        raw_tasks = self.db.execute(statement.sql, params, statement.fetch_mode)
+        if raw_tasks is False:
+            return {
+                'success': False,
+                'message': 'Something went wrong!'
+            }
+
+        tasks = [Task(*raw_task[:5], identifier=raw_task[5], rrule=raw_task[6]) for raw_task in raw_tasks[:limit]]
+        return {
+            'success': True,
+            'tasks': tasks,
+            'cursor': self.page_cursor(tasks[-1]) if tasks else after,
+            'has_more': len(raw_tasks) > limit
+        }
+
+    @staticmethod
+    def page_cursor(task: Task) -> tuple:
+        return Task.priority_rank(task.priority), task.date, task.id
+
+    @staticmethod
+    def sort_key(task: Task) -> tuple:
+        # the ORDER BY of the listings, for merging expanded occurrences into them
+        return Task.priority_rank(task.priority), task.get_datetime(), task.id or 0
+
+    def count_tasks(self, task_filter: TaskFilter | None = None) -> int | bool:
+        # exact number of tasks matching task_filter, without fetching them
+        task_filter = task_filter or TaskFilter()
+        conditions, params = task_filter.conditions()
+        if task_filter.is_bounded():
+            conditions += (queries.SINGLE_CONDITION, )
+        statement = queries.filtered_statement('count', conditions)
+
+        counted = self.db.execute(statement.sql, (self.user_id, *params), statement.fetch_mode)
+        occurrences = self.__occurrences(task_filter)
+        if not counted or occurrences is False:
+            return False
+        return counted[0] + len(occurrences)
+
+    def update_occurrence(
+        self,
+        task_id: int,
+        occurrence: datetime,
+        name: str | None = None,
+        description: str | None = None,
+        date: datetime | None = None,
+        priority: str | None = None,
+        status: str | None = None
+    ) -> dict:
         """
+        Override fields of one occurrence of a recurring series, the other occurrences are left alone.
 
-        # search for tasks in database
-        raw_tasks = self.db.execute(query, params)
+        :param occurrence: scheduled start of the occurrence, as expanded by find_tasks
+        :param date: moves the occurrence, the other None fields keep their current value
+        """
+        series = self.db.execute(
+            queries.SELECT_SERIES_RULE.sql,
+            (task_id, self.user_id),
+            queries.SELECT_SERIES_RULE.fetch_mode
+        )
+        if not series or series[0] is None:
+            return {
+                'success': False,
+                'message': f'Task with id:{task_id} is not a recurring task!'
+            }
 
-        # check if tasks were found
-        if not raw_tasks:
+        rule, start = series
+        if not recurrence.is_occurrence(rule, start, occurrence):
+            return {
+                'success': False,
+                'message': f'Task with id:{task_id} has no occurrence at {occurrence}!'
+            }
+
+        # an occurrence an earlier override moved is listed on the day it was moved to
+        moved = self.db.execute(
+            queries.SELECT_OCCURRENCE_DATE.sql,
+            (task_id, occurrence),
+            queries.SELECT_OCCURRENCE_DATE.fetch_mode
+        )
+        result = moved is not False and self.db.execute(
+            queries.UPSERT_OCCURRENCE.sql,
+            (task_id, occurrence, name, description, date, priority, status),
+            queries.UPSERT_OCCURRENCE.fetch_mode
+        )
+        if not result:
             return {
                 'success': False,
                 'message': 'Something went wrong!'
             }
 
-        # create Task instances and return them
+        moved_to = moved[0] if moved else None
+        self.__invalidate(occurrence, *(day for day in (moved_to, date) if day is not None))
         return {
             'success': True,
-            'tasks': [Task(*raw_task[:5], identifier=raw_task[5]) for raw_task in raw_tasks]
+            'id': task_id,
+            'occurrence': occurrence
+        }
+
+    def complete_occurrence(self, task_id: int, occurrence: datetime) -> dict:
+        return self.update_occurrence(task_id, occurrence, status='Completed')
+
+    def complete_occurrences(self, occurrences: Iterable[tuple[int, datetime]]) -> dict:
+        # (task id, occurrence) pairs, with a single commit
+        occurrences = list(occurrences)
+        try:
+            with self.db.transaction():
+                results = [self.complete_occurrence(task_id, occurrence) for task_id, occurrence in occurrences]
+        except sqlite3.Error as e:
+            # rolled back, none of them was completed
+            results = [
+                self.__bulk_result(task_id, False, f'Task with id:{task_id} was not completed: {e}')
+                for task_id, _ in occurrences
+            ]
+
+        return {
+            'success': all(result['success'] for result in results),
+            'results': results
+        }
+
+    def set_recurrence(self, task_id: int, rrule: str | None) -> dict:
+        # make a task recurring from its date on, change its rule, or None to keep only the first occurrence
+        stored = self.db.execute(
+            queries.SELECT_SERIES_RULE.sql,
+            (task_id, self.user_id),
+            queries.SELECT_SERIES_RULE.fetch_mode
+        )
+        if not stored:
+            return {
+                'success': False,
+                'message': f'Task with id:{task_id} was not found!'
+            }
+
+        start = stored[1]
+
+        recurrence_end = None
+        if rrule:
+            try:
+                rrule, recurrence_end = self.__series_fields(rrule, start)
+            except ValueError as e:
+                return {
+                    'success': False,
+                    'message': str(e)
+                }
+
+        updated = self.db.execute(
+            queries.UPDATE_SERIES_RULE.sql,
+            (rrule or None, recurrence_end, task_id, self.user_id),
+            queries.UPDATE_SERIES_RULE.fetch_mode
+        )
+        if not updated:
+            return {
+                'success': False,
+                'message': 'Something went wrong!'
+            }
+
+        self.__invalidate(None)
+        return {
+            'success': True
         }
 
     def update_task(self, task_id: int, name: str, description: str, date: datetime, priority: str, status: str):
+        # the task may move away from its old day
+        previous_date, rule = self.__stored(task_id)
+
         # Update task in the database
         result = self.db.execute(
-            """
-            UPDATE tasks
-            SET name = ?, description = ?, date = ?, priority = ?, status = ?
-            WHERE id = ? AND user_id = ?
-            """,
-            (name, description, date, priority, status, task_id, self.user_id)
+            queries.UPDATE_TASK.sql,
+            (name, description, date, priority, Task.priority_rank(priority), status, task_id, self.user_id),
+            queries.UPDATE_TASK.fetch_mode
         )
 
         if not result:
@@ -121,21 +401,37 @@ class AgendaController:
                 'message': 'Something went wrong! Task could not be updated'
             }
 
+        if rule:
+            # a moved series start moves a COUNT bounded end with it
+            if date != previous_date:
+                self.db.execute(
+                    queries.UPDATE_SERIES_RULE.sql,
+                    (rule, recurrence.series_end(rule, date), task_id, self.user_id),
+                    queries.UPDATE_SERIES_RULE.fetch_mode
+                )
+            self.__invalidate(None)
+        else:
+            self.__invalidate(previous_date, date)
+
         # Return success with the updated Task instance
         return {
             'success': True,
-            'task': Task(name, description, date, priority, status, identifier=task_id)
+            'task': Task(name, description, date, priority, status, identifier=task_id, rrule=rule)
         }
 
     def delete_task(self, task_id: int):
+        previous_date = self.__stored_date(task_id)
+
         # delete task from database
         deleted = self.db.execute(
-            'DELETE FROM tasks WHERE id = ?',
-            (task_id, )
+            queries.DELETE_TASK.sql,
+            (task_id, ),
+            queries.DELETE_TASK.fetch_mode
         )
 
         # check if deleted
         if deleted:
+            self.__invalidate(previous_date)
             return {
                 'success': True,
             }
@@ -146,17 +442,17 @@ class AgendaController:
         }
 
     def set_as_completed(self, identifier: int) -> dict:
+        previous_date = self.__stored_date(identifier)
+
         update = self.db.execute(
-            """
-                UPDATE tasks
-                SET status = 'Completed'
-                WHERE id = ?
-            """,
-            (identifier, )
+            queries.COMPLETE_TASK.sql,
+            (identifier, ),
+            queries.COMPLETE_TASK.fetch_mode
         )
 
         # check if updated
         if update:
+            self.__invalidate(previous_date)
             return {
                 'success': True,
             }
@@ -164,4 +460,293 @@ class AgendaController:
         return {
             'success': False,
             'message': 'Something went wrong!'
-        }
\ No newline at end of file
+        }
+
+    def add_tasks(self, tasks: Iterable[Task]) -> dict:
+        # insert all tasks with a single commit, each insert is needed for its row id
+        tasks = list(tasks)
+        try:
+            with self.db.transaction():
+                results = [
+                    self.add_task(task.name, task.description, task.date, task.priority, task.status, task.rrule)
+                    for task in tasks
+                ]
+        except sqlite3.Error as e:
+            # rolled back, the row ids handed out before the failure do not exist
+            results = [
+                {
+                    'success': False,
+                    'message': f'Task {task.name!r} was not created: {e}'
+                }
+                for task in tasks
+            ]
+
+        return {
+            'success': all(result['success'] for result in results),
+            'results': results
+        }
+
+    def insert_tasks(self, tasks: Iterable[Task]) -> dict:
+        # bulk insert without row ids, one executemany in one transaction, for imports
+        tasks = list(tasks)
+
+        try:
+            series = {id(task): self.__series_fields(task.rrule, task.get_datetime()) for task in tasks if task.rrule}
+        except ValueError as e:
+            return {
+                'success': False,
+                'message': str(e)
+            }
+
+        try:
+            with self.db.transaction():
+                inserted = self.db.execute_many(
+                    queries.INSERT_TASK.sql,
+                    [
+                        (task.name, task.description, task.date, task.priority,
+                         Task.priority_rank(task.priority), task.status, self.user_id,
+                         *series.get(id(task), (None, None)))
+                        for task in tasks
+                    ]
+                )
+        except sqlite3.Error as e:
+            # rolled back, none of the tasks was created
+            return {
+                'success': False,
+                'message': f'Tasks couldn\'t be created: {e}'
+            }
+
+        self.__invalidate(*(None if task.rrule else task.date for task in tasks))
+        return {
+            'success': True,
+            'count': inserted
+        }
+
+    def update_tasks(self, tasks: Iterable[Task]) -> dict:
+        tasks = list(tasks)
+        # checked up front so one bad task fails alone instead of rolling back the batch
+        invalid = {
+            task.id: f'Task with id:{task.id} has an unexpected status or priority!'
+            for task in tasks
+            if task.status not in Task.statuses() or task.priority not in Task.priorities()
+        }
+        error = None
+
+        try:
+            with self.db.transaction():
+                existing = self.__existing([task.id for task in tasks])
+                changed = [task for task in tasks if task.id in existing and task.id not in invalid]
+                self.db.execute_many(
+                    queries.UPDATE_TASK.sql,
+                    [
+                        (task.name, task.description, task.date, task.priority,
+                         Task.priority_rank(task.priority), task.status, task.id, self.user_id)
+                        for task in changed
+                    ]
+                )
+                # a moved series start moves a COUNT bounded end with it, as in update_task
+                moved_series = [
+                    (task, existing[task.id][1]) for task in changed
+                    if existing[task.id][1] and task.get_datetime() != existing[task.id][0]
+                ]
+                self.db.execute_many(
+                    queries.UPDATE_SERIES_RULE.sql,
+                    [
+                        (rule, recurrence.series_end(rule, task.get_datetime()), task.id, self.user_id)
+                        for task, rule in moved_series
+                    ]
+                )
+        except sqlite3.Error as e:
+            # rolled back, none of the tasks was updated
+            error = e
+        else:
+            # None for a series, its occurrences can fall on any day
+            self.__invalidate(
+                *(None if existing[task.id][1] else existing[task.id][0] for task in changed),
+                *(task.date for task in changed)
+            )
+
+        results = []
+        for task in tasks:
+            if error is not None:
+                result = self.__bulk_result(task.id, False, f'Task with id:{task.id} was not updated: {error}')
+            elif task.id in invalid:
+                result = self.__bulk_result(task.id, False, invalid[task.id])
+            else:
+                result = self.__bulk_result(task.id, task.id in existing)
+            if result['success']:
+                result['task'] = task
+            results.append(result)
+
+        return {
+            'success': all(result['success'] for result in results),
+            'results': results
+        }
+
+    def delete_tasks(self, task_ids: Iterable[int]) -> dict:
+        return self.__execute_for_ids(queries.DELETE_USER_TASK.sql, task_ids)
+
+    def complete_tasks(self, task_ids: Iterable[int]) -> dict:
+        return self.__execute_for_ids(queries.COMPLETE_USER_TASK.sql, task_ids)
+
+    def __execute_for_ids(self, query: str, task_ids: Iterable[int]) -> dict:
+        # run query once per owned id in one transaction, query takes (id, user_id)
+        task_ids = list(task_ids)
+
+        try:
+            with self.db.transaction():
+                existing = self.__existing(task_ids)
+                self.db.execute_many(
+                    query,
+                    [(task_id, self.user_id) for task_id in task_ids if task_id in existing]
+                )
+        except sqlite3.Error as e:
+            # rolled back, nothing changed
+            results = [
+                self.__bulk_result(task_id, False, f'Task with id:{task_id} was not changed: {e}')
+                for task_id in task_ids
+            ]
+        else:
+            # None for a series, its occurrences can fall on any day
+            self.__invalidate(*(None if rule else date for date, rule in existing.values()))
+            results = [self.__bulk_result(task_id, task_id in existing) for task_id in task_ids]
+
+        return {
+            'success': all(result['success'] for result in results),
+            'results': results
+        }
+
+    def __existing(self, task_ids: list[int]) -> dict[int, tuple[datetime, str | None]]:
+        # stored date and recurrence rule of the ids from task_ids that belong to this user
+        found = {}
+        for start in range(0, len(task_ids), self.BATCH_SIZE):
+            chunk = task_ids[start:start + self.BATCH_SIZE]
+            rows = self.db.execute(
+                f"SELECT id, date, rrule FROM tasks WHERE user_id = ? AND id IN ({', '.join('?' * len(chunk))})",
+                (self.user_id, *chunk),
+                'all'
+            )
+            found.update((task_id, (date, rule)) for task_id, date, rule in rows or ())
+
+        return found
+
+    def __stored(self, task_id: int) -> tuple[datetime | None, str | None]:
+        # stored date and recurrence rule of a task
+        stored = self.db.execute(
+            queries.SELECT_TASK_DATE.sql,
+            (task_id, ),
+            queries.SELECT_TASK_DATE.fetch_mode
+        )
+        return tuple(stored) if stored else (None, None)
+
+    def __stored_date(self, task_id: int) -> datetime | None:
+        # None for a series as well, its occurrences can fall on any day
+        date, rule = self.__stored(task_id)
+        return None if rule else date
+
+    @staticmethod
+    def __series_fields(rule: str, start: datetime) -> tuple[str, datetime | None]:
+        # normalized rule and last occurrence to store, raises ValueError for an invalid rule
+        rule = recurrence.normalize_rule(rule)
+        recurrence.parse_rule(rule, start)
+        return rule, recurrence.series_end(rule, start)
+
+    def __occurrences(self, task_filter: TaskFilter) -> list[Task] | bool:
+        """
+        Occurrences of the user's series inside task_filter's range that match it, expanded on demand.
+
+        Only bounded filters are expanded, elsewhere a series is listed once as its first occurrence.
+        Overridden fields replace the series' ones, occurrences moved into the range are included.
+        """
+        if not task_filter.is_bounded():
+            return []
+
+        start, end = task_filter.start, task_filter.end
+        series = self.db.execute(
+            queries.SELECT_SERIES.sql,
+            (self.user_id, end, start, start, end),
+            queries.SELECT_SERIES.fetch_mode
+        )
+        if not series:
+            return series
+
+        overrides = self.db.execute(
+            queries.SELECT_OCCURRENCES.sql,
+            (self.user_id, start, end, start, end),
+            queries.SELECT_OCCURRENCES.fetch_mode
+        )
+        if overrides is False:
+            return False
+        overridden = {(row[0], row[1]): row[2:] for row in overrides}
+
+        tasks = []
+        for raw_series in series:
+            master = Task(*raw_series[:5], identifier=raw_series[5], rrule=raw_series[6])
+            master_start = master.get_datetime()
+            starts = set(recurrence.occurrences(master.rrule, master_start, start, end))
+            # moved in from outside the range, kept while the rule still produces them
+            starts.update(
+                occurrence for task_id, occurrence in overridden
+                if task_id == master.id and occurrence not in starts
+                and recurrence.is_occurrence(master.rrule, master_start, occurrence)
+            )
+
+            for occurrence in starts:
+                name, description, date, priority, status = overridden.get((master.id, occurrence), (None, ) * 5)
+                task = Task(
+                    name if name is not None else master.name,
+                    description if description is not None else master.description,
+                    date or occurrence,
+                    priority or master.priority,
+                    status or master.status,
+                    identifier=master.id,
+                    rrule=master.rrule,
+                    occurrence=occurrence
+                )
+                if task_filter.matches(task):
+                    tasks.append(task)
+
+        return tasks
+
+    def __query_tasks(self, task_filter: TaskFilter) -> list[Task] | bool:
+        # search for tasks in database, ordered by the (user_id, day, priority_rank) index
+        conditions, params = task_filter.conditions()
+        if task_filter.is_bounded():
+            conditions += (queries.SINGLE_CONDITION, )
+        statement = queries.filtered_statement('list', conditions)
+        raw_tasks = self.db.execute(statement.sql, (self.user_id, *params), statement.fetch_mode)
+        occurrences = self.__occurrences(task_filter)
+        if raw_tasks is False or occurrences is False:
+            return False
+
+        tasks = [Task(*raw_task[:5], identifier=raw_task[5], rrule=raw_task[6]) for raw_task in raw_tasks]
+        if occurrences:
+            tasks = sorted(tasks + occurrences, key=self.sort_key)
+        return tasks
+
+    def __invalidate(self, *dates: datetime | str | None):
+        # forget cached listings of every day touched by a change
+        for day in {self.__day_of(date) for date in dates}:
+            self.cache.invalidate_day(self.user_id, day)
+
+    @staticmethod
+    def __day_of(date: datetime | str | None) -> str | None:
+        if isinstance(date, datetime):
+            return date.strftime("%Y-%m-%d")
+        if isinstance(date, str):
+            return date[:10]
+        return None
+
+    @staticmethod
+    def __bulk_result(task_id: int, success: bool, message: str | None = None) -> dict:
+        if success:
+            return {
+                'success': True,
+                'id': task_id
+            }
+
+        return {
+            'success': False,
+            'id': task_id,
+            'message': message or f'Task with id:{task_id} was not found!'
+        }
@@ -0,0 +1,96 @@
+import os
+import re
+import sqlite3
+
+
+class ConnectionProfile:
+    # tuned for one UI writer with readers (tray, background workers) on the same file
+    DEFAULT_PRAGMAS: dict[str, str | int] = {
+        'journal_mode': 'WAL',  # readers don't block on the writer and the other way around
+        'synchronous': 'NORMAL',  # safe with WAL, fsync only on checkpoints
+        'cache_size': -16000,  # negative is in KiB, ~16 MB page cache
+        'mmap_size': 268435456,  # 256 MB of memory mapped reads
+        'temp_store': 'MEMORY',
+        'foreign_keys': 'ON',
+    }
+    ENV_PREFIX: str = 'TASKMANAGER_DB_'
+    __VALUE: re.Pattern = re.compile(r'-?[\w.]+')
+
+    db_path: str | None
+    pragmas: dict[str, str | int]
+    timeout: float
+    cached_statements: int
+    stats: bool
+    slow_query_ms: float | None
+
+    def __init__(
+        self,
+        db_path: str | None = None,
+        pragmas: dict | None = None,
+        timeout: float = 5.0,
+        cached_statements: int = 256,
+        stats: bool = False,
+        slow_query_ms: float | None = None
+    ):
+        self.db_path = db_path
+        self.pragmas = {**self.DEFAULT_PRAGMAS, **(pragmas or {})}
+        self.timeout = timeout
+        # prepared statements kept per connection, room for every named query plus ad-hoc ones
+        self.cached_statements = cached_statements
+        # opt-in query instrumentation, see ContextManager.query_stats; a slow query threshold turns it on too
+        self.stats = stats or slow_query_ms is not None
+        self.slow_query_ms = slow_query_ms
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(db_path={self.db_path!r}, pragmas={self.pragmas!r}, "
+            f"timeout={self.timeout!r}, cached_statements={self.cached_statements!r}, "
+            f"stats={self.stats!r}, slow_query_ms={self.slow_query_ms!r})"
+        )
+
+    @classmethod
+    def from_env(cls, environ=None) -> 'ConnectionProfile':
+        # TASKMANAGER_DB_PATH, TASKMANAGER_DB_TIMEOUT, TASKMANAGER_DB_CACHED_STATEMENTS, TASKMANAGER_DB_STATS
+        # and TASKMANAGER_DB_SLOW_QUERY_MS override the connection,
+        # any other TASKMANAGER_DB_<NAME> overrides the pragma <name>
+        environ = os.environ if environ is None else environ
+        db_path = None
+        timeout = 5.0
+        cached_statements = 256
+        stats = False
+        slow_query_ms = None
+        pragmas = {}
+
+        for key, value in environ.items():
+            if not key.startswith(cls.ENV_PREFIX):
+                continue
+
+            name = key[len(cls.ENV_PREFIX):].lower()
+            if name == 'path':
+                db_path = value
+            elif name == 'timeout':
+                timeout = float(value)
+            elif name == 'cached_statements':
+                cached_statements = int(value)
+            elif name == 'stats':
+                stats = value.lower() in ('1', 'true', 'yes', 'on')
+            elif name == 'slow_query_ms':
+                slow_query_ms = float(value)
+            else:
+                pragmas[name] = value
+
+        return cls(db_path, pragmas, timeout, cached_statements, stats, slow_query_ms)
+
+    def settings(self) -> tuple:
+        # everything but the path, pragma values compared as the text apply() sends
+        return (
+            tuple(sorted((name, str(value).lower()) for name, value in self.pragmas.items())),
+            self.timeout, self.cached_statements, self.stats, self.slow_query_ms
+        )
+
+    def apply(self, connection: sqlite3.Connection):
+        for name, value in self.pragmas.items():
+            # pragmas can't be bound as parameters, only allow plain names and values
+            if not name.isidentifier() or not self.__VALUE.fullmatch(str(value)):
+                raise ValueError(f"Invalid pragma {name}={value!r}")
+            connection.execute(f'PRAGMA {name} = {value}')
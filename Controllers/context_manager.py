@@ -1,46 +1,438 @@
 import os.path
 import sqlite3
 import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from Controllers.connection_profile import ConnectionProfile
+from Controllers.query_stats import QueryStats
+
+
+def adapt_datetime(value: datetime) -> str:
+    # one fixed text format, sorts like the datetime itself so date ranges stay index seeks
+    return value.isoformat(' ', 'seconds')
+
+
+def convert_datetime(value: bytes) -> datetime | str:
+    # DATETIME columns come back as datetime, anything unparsable is left as text
+    try:
+        return datetime.fromisoformat(value.decode())
+    except ValueError:
+        return value.decode()
+
+
+sqlite3.register_adapter(datetime, adapt_datetime)
+sqlite3.register_converter('DATETIME', convert_datetime)
 
 
 class ContextManager:
-    def __init__(self):
-        base_path = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
-        db_path = os.path.join(base_path, 'database.db')
+    # schema changes applied in order on top of create_tables,
+    # PRAGMA user_version holds the number of migrations already applied
+    MIGRATIONS: tuple[tuple[str, ...], ...] = (
+        # 1: composite indexes for the per-day agenda and status filters
+        (
+            "CREATE INDEX IF NOT EXISTS idx_tasks_user_date ON tasks (user_id, date)",
+            "CREATE INDEX IF NOT EXISTS idx_tasks_user_status ON tasks (user_id, status)",
+        ),
+        # 2: stored priority rank so ORDER BY priority is served by an index instead of a CASE sort
+        (
+            "ALTER TABLE tasks ADD COLUMN priority_rank INTEGER NOT NULL DEFAULT 5",
+            """
+            UPDATE tasks SET priority_rank = CASE priority
+                WHEN 'Critical' THEN 1
+                WHEN 'High' THEN 2
+                WHEN 'Medium' THEN 3
+                WHEN 'Low' THEN 4
+                ELSE 5
+            END
+            """,
+            "DROP INDEX IF EXISTS idx_tasks_user_date",
+            "CREATE INDEX IF NOT EXISTS idx_tasks_user_date_rank ON tasks (user_id, date, priority_rank)",
+            "CREATE INDEX IF NOT EXISTS idx_tasks_user_rank ON tasks (user_id, priority_rank, date)",
+        ),
+        # 3: users referenced by tasks must exist now that foreign_keys is ON
+        (
+            "INSERT OR IGNORE INTO users (id, first_name, last_name) VALUES (1, 'Default', 'User')",
+            """
+            INSERT OR IGNORE INTO users (id, first_name, last_name)
+            SELECT DISTINCT user_id, 'User', user_id FROM tasks WHERE user_id IS NOT NULL
+            """,
+        ),
+        # 4: dates stored with or without microseconds are normalized to the adapt_datetime format
+        (
+            """
+            UPDATE tasks SET date = strftime('%Y-%m-%d %H:%M:%S', date)
+            WHERE strftime('%Y-%m-%d %H:%M:%S', date) IS NOT NULL
+            AND date IS NOT strftime('%Y-%m-%d %H:%M:%S', date)
+            """,
+        ),
+        # 5: full-text index over task names and descriptions, kept in sync with tasks by triggers
+        (
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+                name, description,
+                content='tasks', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+                INSERT INTO tasks_fts (rowid, name, description) VALUES (new.id, new.name, new.description);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+                INSERT INTO tasks_fts (tasks_fts, rowid, name, description)
+                VALUES ('delete', old.id, old.name, old.description);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF name, description ON tasks BEGIN
+                INSERT INTO tasks_fts (tasks_fts, rowid, name, description)
+                VALUES ('delete', old.id, old.name, old.description);
+                INSERT INTO tasks_fts (rowid, name, description) VALUES (new.id, new.name, new.description);
+            END
+            """,
+            # index the tasks stored before this migration
+            "INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')",
+        ),
+        # 6: tasks per (user, day, status, priority) kept by triggers, month views read it instead of tasks
+        (
+            """
+            CREATE TABLE IF NOT EXISTS task_day_counts (
+                user_id INTEGER NOT NULL,
+                day TEXT NOT NULL,
+                status TEXT NOT NULL,
+                priority TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (user_id, day, status, priority)
+            ) WITHOUT ROWID
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS task_day_counts_insert AFTER INSERT ON tasks
+            WHEN new.user_id IS NOT NULL BEGIN
+                INSERT INTO task_day_counts (user_id, day, status, priority, count)
+                VALUES (new.user_id, substr(new.date, 1, 10), new.status, new.priority, 1)
+                ON CONFLICT DO UPDATE SET count = count + 1;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS task_day_counts_delete AFTER DELETE ON tasks
+            WHEN old.user_id IS NOT NULL BEGIN
+                UPDATE task_day_counts SET count = count - 1
+                WHERE user_id = old.user_id AND day = substr(old.date, 1, 10)
+                AND status = old.status AND priority = old.priority;
+                DELETE FROM task_day_counts
+                WHERE user_id = old.user_id AND day = substr(old.date, 1, 10)
+                AND status = old.status AND priority = old.priority AND count <= 0;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS task_day_counts_update AFTER UPDATE OF user_id, date, status, priority ON tasks
+            BEGIN
+                UPDATE task_day_counts SET count = count - 1
+                WHERE user_id = old.user_id AND day = substr(old.date, 1, 10)
+                AND status = old.status AND priority = old.priority;
+                DELETE FROM task_day_counts
+                WHERE user_id = old.user_id AND day = substr(old.date, 1, 10)
+                AND status = old.status AND priority = old.priority AND count <= 0;
+                INSERT INTO task_day_counts (user_id, day, status, priority, count)
+                SELECT new.user_id, substr(new.date, 1, 10), new.status, new.priority, 1
+                WHERE new.user_id IS NOT NULL
+                ON CONFLICT DO UPDATE SET count = count + 1;
+            END
+            """,
+            # counts of the tasks stored before this migration
+            """
+            INSERT INTO task_day_counts (user_id, day, status, priority, count)
+            SELECT user_id, substr(date, 1, 10), status, priority, COUNT(*) FROM tasks
+            WHERE user_id IS NOT NULL
+            GROUP BY user_id, substr(date, 1, 10), status, priority
+            """,
+        ),
+        # 7: recurring series stored once with an RRULE, plus per-occurrence overrides and completions;
+        # series rows are expanded per requested range, so the day summary only counts single tasks
+        (
+            "ALTER TABLE tasks ADD COLUMN rrule TEXT NULL",
+            # start of the last occurrence, NULL for series without an end
+            "ALTER TABLE tasks ADD COLUMN recurrence_end DATETIME NULL",
+            "CREATE INDEX IF NOT EXISTS idx_tasks_user_series ON tasks (user_id, date) WHERE rrule IS NOT NULL",
+            """
+            CREATE TABLE IF NOT EXISTS task_occurrences (
+                task_id INTEGER NOT NULL REFERENCES tasks (id) ON DELETE CASCADE,
+                occurrence DATETIME NOT NULL,
+                name TEXT NULL,
+                description TEXT NULL,
+                date DATETIME NULL,
+                priority TEXT NULL,
+                status TEXT NULL CHECK (status IN ('Pending', 'In Progress', 'Completed', 'On Hold', 'Cancelled')),
+                PRIMARY KEY (task_id, occurrence)
+            ) WITHOUT ROWID
+            """,
+            "DROP TRIGGER IF EXISTS task_day_counts_insert",
+            "DROP TRIGGER IF EXISTS task_day_counts_delete",
+            "DROP TRIGGER IF EXISTS task_day_counts_update",
+            """
+            CREATE TRIGGER task_day_counts_insert AFTER INSERT ON tasks
+            WHEN new.user_id IS NOT NULL AND new.rrule IS NULL BEGIN
+                INSERT INTO task_day_counts (user_id, day, status, priority, count)
+                VALUES (new.user_id, substr(new.date, 1, 10), new.status, new.priority, 1)
+                ON CONFLICT DO UPDATE SET count = count + 1;
+            END
+            """,
+            """
+            CREATE TRIGGER task_day_counts_delete AFTER DELETE ON tasks
+            WHEN old.user_id IS NOT NULL AND old.rrule IS NULL BEGIN
+                UPDATE task_day_counts SET count = count - 1
+                WHERE user_id = old.user_id AND day = substr(old.date, 1, 10)
+                AND status = old.status AND priority = old.priority;
+                DELETE FROM task_day_counts
+                WHERE user_id = old.user_id AND day = substr(old.date, 1, 10)
+                AND status = old.status AND priority = old.priority AND count <= 0;
+            END
+            """,
+            """
+            CREATE TRIGGER task_day_counts_update AFTER UPDATE OF user_id, date, status, priority, rrule ON tasks
+            BEGIN
+                UPDATE task_day_counts SET count = count - 1
+                WHERE old.rrule IS NULL AND user_id = old.user_id AND day = substr(old.date, 1, 10)
+                AND status = old.status AND priority = old.priority;
+                DELETE FROM task_day_counts
+                WHERE old.rrule IS NULL AND user_id = old.user_id AND day = substr(old.date, 1, 10)
+                AND status = old.status AND priority = old.priority AND count <= 0;
+                INSERT INTO task_day_counts (user_id, day, status, priority, count)
+                SELECT new.user_id, substr(new.date, 1, 10), new.status, new.priority, 1
+                WHERE new.user_id IS NOT NULL AND new.rrule IS NULL
+                ON CONFLICT DO UPDATE SET count = count + 1;
+            END
+            """,
+        ),
+        # 8: the day of a task as a virtual column, a one-day listing is read from its index already in
+        # ORDER BY order instead of a date range sorted afterwards
+        (
+            "ALTER TABLE tasks ADD COLUMN day TEXT GENERATED ALWAYS AS (substr(date, 1, 10)) VIRTUAL",
+            "CREATE INDEX IF NOT EXISTS idx_tasks_user_day_rank ON tasks (user_id, day, priority_rank, date, id)",
+        ),
+        # 9: occurrences moved into a listed range are found by their new date, not by scanning every override
+        (
+            "CREATE INDEX IF NOT EXISTS idx_task_occurrences_date ON task_occurrences (date) WHERE date IS NOT NULL",
+        ),
+    )
+
+    # one shared instance per database file, see shared()
+    __instances: dict[str, 'ContextManager'] = {}
+    __instances_lock = threading.Lock()
+
+    def __init__(self, profile: ConnectionProfile | None = None):
+        # deployments override the defaults through TASKMANAGER_DB_* variables
+        self.profile = profile or ConnectionProfile.from_env()
+        self.db_path = db_path = self.resolve_path(self.profile)
 
         # Create database if doesnt exist
-        if not os.path.exists(db_path):
+        if db_path != ':memory:' and not os.path.exists(db_path):
             open(db_path, 'w').close()
 
         # Create connection with database
-        self.__connection = sqlite3.connect(db_path)
+        self.__connection = sqlite3.connect(
+            db_path,
+            timeout=self.profile.timeout,
+            cached_statements=self.profile.cached_statements,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            # shared with background workers, access is serialized by self.__lock
+            check_same_thread=False
+        )
+        self.profile.apply(self.__connection)
         self.__cursor = self.__connection.cursor()
-        self.create_tables()
+        self.__transaction_depth = 0
+        self.__lock = threading.RLock()
+        self.__fetch_modes: dict[str, str] = {}
+        # None unless the profile opts in, the uninstrumented path only pays for one check
+        self.query_stats = QueryStats(self.profile.slow_query_ms) if self.profile.stats else None
+
+        # schema DDL only runs when the stored version is behind
+        if self.schema_version() < len(self.MIGRATIONS):
+            self.create_tables()
+            self.migrate()
+
+    @classmethod
+    def shared(cls, profile: ConnectionProfile | None = None) -> 'ContextManager':
+        # process wide connection for a database file, controllers borrow it instead of opening their own
+        profile = profile or ConnectionProfile.from_env()
+        db_path = cls.resolve_path(profile)
 
-    def execute(self, query: str, params: list | tuple = (), fetch_mode: str = 'all') -> bool | list | int:
+        with cls.__instances_lock:
+            instance = cls.__instances.get(db_path)
+            if instance is None:
+                instance = cls.__instances[db_path] = cls(profile)
+            elif instance.profile.settings() != profile.settings():
+                # the open connection would silently ignore the new pragmas and limits
+                raise ValueError(
+                    f"Database {db_path} is already open with {instance.profile!r}, not {profile!r}"
+                )
+
+        return instance
+
+    @staticmethod
+    def resolve_path(profile: ConnectionProfile) -> str:
+        # absolute path with symlinks resolved, every spelling of one file maps to one shared instance
+        if profile.db_path == ':memory:':
+            return profile.db_path
+        if profile.db_path is not None:
+            return os.path.realpath(profile.db_path)
+
+        base_path = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
+        return os.path.realpath(os.path.join(base_path, 'database.db'))
+
+    def close(self):
+        with self.__instances_lock:
+            if self.__instances.get(self.db_path) is self:
+                del self.__instances[self.db_path]
+
+        self.__connection.close()
+
+    def schema_version(self) -> int:
+        with self.__lock:
+            return self.__cursor.execute('PRAGMA user_version').fetchone()[0]
+
+    def execute(self, query: str, params: list | tuple = (), fetch_mode: str | None = None) -> bool | list | tuple | int:
+        # fetch_mode: 'all', 'one', 'lastrowid', 'rowcount' or 'none', inferred from the query when not given
+        if fetch_mode is None:
+            fetch_mode = self.__infer_fetch_mode(query)
+
+        # the connection is shared between threads, statement and fetch must not interleave
+        with self.__lock:
+            started = time.perf_counter() if self.query_stats is not None else None
+            try:
+                self.__cursor.execute(query, params)
+
+                # reads never open a transaction, writes inside transaction() wait for its commit
+                if self.__transaction_depth == 0 and self.__connection.in_transaction:
+                    self.__connection.commit()
+            except sqlite3.Error as e:  # Catch SQLite-specific errors
+                # stderr, stdout may be a machine readable stream (cli.py)
+                print(f"SQLite execution error: {e}", file=sys.stderr)
+                if started is not None:
+                    self.__record(query, params, started, failed=True)
+                # inside transaction() the error rolls the whole block back instead of committing the rest
+                if self.__transaction_depth > 0:
+                    raise
+                return False
+
+            if fetch_mode == 'all':
+                result = self.__cursor.fetchall()
+                rows = len(result)
+            elif fetch_mode == 'one':
+                result = self.__cursor.fetchone()
+                rows = int(result is not None)
+            elif fetch_mode == 'lastrowid':
+                # return inserted row id
+                result = self.__cursor.lastrowid or False
+                rows = self.__cursor.rowcount
+            elif fetch_mode == 'rowcount':
+                result = rows = self.__cursor.rowcount
+            else:
+                result = True
+                rows = self.__cursor.rowcount
+
+            if started is not None:
+                self.__record(query, params, started, max(rows, 0))
+            return result
+
+    def __record(self, query: str, params, started: float, rows: int = 0, failed: bool = False):
+        # called with the lock held, right after the statement and its fetch
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.query_stats.record(query, elapsed_ms, rows, failed)
+
+        if self.query_stats.is_slow(elapsed_ms):
+            self.query_stats.report_slow(query, elapsed_ms, self.__query_plan(query, params))
+
+    def __query_plan(self, query: str, params) -> list | None:
+        # EXPLAIN only compiles the statement, writes are not run again
         try:
-            self.__cursor.execute(query, params)
-            self.__connection.commit()
-        except sqlite3.Error as e:  # Catch SQLite-specific errors
-            print(f"SQLite execution error: {e}")
-            return False
-
-        lowercase_query = query.strip().upper()
-
-        # If it's a SELECT query, fetch and return rows
-        if lowercase_query.startswith("SELECT"):
-            if fetch_mode == 'one':
-                return self.__cursor.fetchone()
+            return self.__connection.execute(f'EXPLAIN QUERY PLAN {query}', params).fetchall()
+        except sqlite3.Error:
+            return None
+
+    def stats_snapshot(self) -> dict:
+        # per statement latency and row counts, empty when the profile does not enable stats
+        return self.query_stats.snapshot() if self.query_stats is not None else {}
+
+    def __infer_fetch_mode(self, query: str) -> str:
+        # parse each distinct query text only once
+        fetch_mode = self.__fetch_modes.get(query)
+        if fetch_mode is None:
+            uppercase_query = query.lstrip().upper()
+            if uppercase_query.startswith("SELECT"):
+                fetch_mode = 'all'
+            elif uppercase_query.startswith("INSERT"):
+                fetch_mode = 'lastrowid'
             else:
-                return self.__cursor.fetchall()
+                fetch_mode = 'none'
+            self.__fetch_modes[query] = fetch_mode
 
-        # If it's an insert query, return inserted row id
-        elif lowercase_query.startswith("INSERT"):
-            if self.__cursor.lastrowid:
-                return self.__cursor.lastrowid
-            return False
+        return fetch_mode
 
-        return True
+    def execute_many(self, query: str, params_seq) -> bool | int:
+        # run one statement for every parameter set, returns the number of affected rows
+        with self.__lock:
+            started = time.perf_counter() if self.query_stats is not None else None
+            try:
+                self.__cursor.executemany(query, params_seq)
+
+                if self.__transaction_depth == 0 and self.__connection.in_transaction:
+                    self.__connection.commit()
+            except sqlite3.Error as e:
+                print(f"SQLite execution error: {e}", file=sys.stderr)
+                if started is not None:
+                    self.query_stats.record(query, (time.perf_counter() - started) * 1000, failed=True)
+                # rows before the failing parameter set must not be committed either
+                if self.__transaction_depth > 0:
+                    raise
+                return False
+
+            if started is not None:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                self.query_stats.record(query, elapsed_ms, max(self.__cursor.rowcount, 0))
+                if self.query_stats.is_slow(elapsed_ms):
+                    # batches are reported without a plan, there is no single parameter set to explain
+                    self.query_stats.report_slow(query, elapsed_ms, None)
+            return self.__cursor.rowcount
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group many writes into a single commit, other threads wait until the outermost block is done.
+
+        A failing statement raises its sqlite3.Error inside the block and everything the block wrote
+        is rolled back. Nested blocks are savepoints, a caller catching the error of an inner block
+        keeps the writes of the outer one.
+        """
+        with self.__lock:
+            savepoint = f'transaction_{self.__transaction_depth}'
+            if self.__transaction_depth == 0:
+                self.__cursor.execute('BEGIN')
+            else:
+                self.__cursor.execute(f'SAVEPOINT {savepoint}')
+            self.__transaction_depth += 1
+
+            try:
+                yield self
+            except BaseException:
+                self.__transaction_depth -= 1
+                if self.__transaction_depth == 0:
+                    self.__connection.rollback()
+                else:
+                    self.__cursor.execute(f'ROLLBACK TO {savepoint}')
+                    self.__cursor.execute(f'RELEASE {savepoint}')
+                raise
+
+            self.__transaction_depth -= 1
+            if self.__transaction_depth == 0:
+                self.__connection.commit()
+            else:
+                self.__cursor.execute(f'RELEASE {savepoint}')
 
     def create_tables(self):
         self.execute(
@@ -65,3 +457,19 @@ class ContextManager:
                 FOREIGN KEY(user_id) REFERENCES users(id)
             )
         """)
+
+    def migrate(self):
+        version = self.schema_version()
+
+        for number, statements in enumerate(self.MIGRATIONS[version:], start=version + 1):
+            try:
+                # run each migration with its version bump as one transaction
+                with self.transaction():
+                    for statement in statements:
+                        self.__cursor.execute(statement)
+                    self.__cursor.execute(f'PRAGMA user_version = {number}')
+            except sqlite3.Error as e:
+                print(f"SQLite migration {number} error: {e}", file=sys.stderr)
+                return False
+
+        return True
@@ -1,56 +1,93 @@
+"""
+Seeded synthetic task data on the real schema, for benchmarks and load testing.
+
+The same seed always produces the same users and tasks. Run from the project root:
+
+    python -m Controllers.gen_tasks --tasks 100000 --users 10 --seed 42 --db /tmp/load.db
+"""
+import argparse
+import random
+import time
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from itertools import islice
+
+from Controllers import queries
+from Controllers.connection_profile import ConnectionProfile
+from Controllers.context_manager import ContextManager
+from Models.task import Task
+
+# small fixed vocabulary, Faker is too slow for a million rows and its output changes between versions
+WORDS = (
+    'review', 'report', 'invoice', 'meeting', 'call', 'email', 'plan', 'budget', 'design', 'draft',
+    'release', 'deploy', 'backup', 'update', 'dentist', 'groceries', 'gym', 'laundry', 'birthday', 'tickets',
+    'taxes', 'insurance', 'car', 'garden', 'kitchen', 'project', 'client', 'team', 'sprint', 'roadmap',
+    'contract', 'slides', 'notes', 'travel', 'hotel', 'flight', 'doctor', 'school', 'homework', 'library',
+)
+
+START_DATE = datetime(2024, 1, 1)
+DAYS = 730
+CHUNK_SIZE = 10000
+
+
+def generate_tasks(count: int, users: int = 1, seed: int = 42, start: datetime = START_DATE, days: int = DAYS) -> Iterator[tuple[int, Task]]:
+    """
+    Yield count (user_id, Task) pairs spread over users 1..users and days from start.
+
+    :param seed: seed of the random generator, equal seeds give equal data
+    """
+    rng = random.Random(seed)
+    priorities = Task.priorities()
+    statuses = Task.statuses()
+
+    for number in range(count):
+        name = ' '.join(rng.sample(WORDS, 2)).capitalize()
+        description = ' '.join(rng.choices(WORDS, k=rng.randint(4, 12))).capitalize() + '.'
+        # whole minutes, like tasks created through the window
+        date = start + timedelta(days=rng.randrange(days), minutes=rng.randrange(24 * 60))
+
+        yield rng.randint(1, users), Task(
+            f'{name} {number}', description, date, rng.choice(priorities), rng.choice(statuses)
+        )
+
+
+def populate(db: ContextManager, count: int, users: int = 1, seed: int = 42, chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Insert generated users and tasks, chunk_size rows per transaction.
+
+    :return: the number of tasks inserted
+    """
+    with db.transaction():
+        db.execute_many(
+            "INSERT OR IGNORE INTO users (id, first_name, last_name) VALUES (?, ?, ?)",
+            [(user_id, 'User', str(user_id)) for user_id in range(1, users + 1)]
+        )
+
+    inserted = 0
+    tasks = generate_tasks(count, users, seed)
+    while chunk := list(islice(tasks, chunk_size)):
+        with db.transaction():
+            rows = db.execute_many(queries.INSERT_TASK.sql, [
+                (task.name, task.description, task.date, task.priority, Task.priority_rank(task.priority), task.status, user_id, None, None)
+                for user_id, task in chunk
+            ])
+        inserted += rows or 0
+
+    return inserted
+
+
 if __name__ == '__main__':
-    import sqlite3
-    from datetime import datetime, timedelta
-    import random
-    import faker
-
-    # Initialize Faker to generate random data
-    fake = faker.Faker()
-
-    # Generate 100 random tasks
-    tasks = []
-    for _ in range(1000):
-        name = fake.word().capitalize()
-        description = fake.sentence()
-
-        # Generate random date between 2024-01-01 and 2025-12-31
-        start_date = datetime(2024, 1, 1)
-        random_date = start_date + timedelta(days=random.randint(0, 730))
-
-        # Format the random date as a string in 'YYYY-MM-DD HH:MM:SS'
-        random_date_str = random_date.strftime('%Y-%m-%d %H:%M:%S')
-
-        # Random priority (1-3), status (1 = Pending, 2 = In Progress, 3 = Completed), user_id = 1
-        priority = random.choice(('Low', 'Medium', 'High', 'Critical'))
-        status = random.choice(['Pending', 'In Progress', 'Completed', 'On Hold', 'Cancelled'])  # 1 = Pending, 2 = In Progress, 3 = Completed, etc.
-        user_id = 1
-
-        tasks.append((name, description, random_date_str, priority, status, user_id))
-
-    # Connect to the SQLite database (or create it)
-    conn = sqlite3.connect('database.db')
-    cursor = conn.cursor()
-
-    # Create the tasks table if it doesn't exist
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS tasks (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT,
-        description TEXT,
-        date TEXT,
-        priority INTEGER,
-        status INTEGER,
-        user_id INTEGER
-    )
-    """)
-
-    # Insert the generated tasks into the database
-    for task in tasks:
-        cursor.execute("""
-        INSERT INTO tasks (name, description, date, priority, status, user_id)
-        VALUES (?, ?, ?, ?, ?, ?)
-        """, task)
-
-    # Commit the changes and close the connection
-    conn.commit()
-    conn.close()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=1000)
+    parser.add_argument('--users', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--db', help='database file, TASKMANAGER_DB_PATH or the app database by default')
+    args = parser.parse_args()
+
+    profile = ConnectionProfile.from_env()
+    if args.db:
+        profile.db_path = args.db
+
+    started = time.perf_counter()
+    created = populate(ContextManager(profile), args.tasks, args.users, args.seed)
+    print(f"Created {created} tasks for {args.users} users in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,194 @@
+from functools import lru_cache
+
+
+class Statement:
+    # named SQL text built once at import, the text is the key of sqlite3's statement cache
+    __slots__ = ('name', 'sql', 'fetch_mode')
+
+    name: str
+    sql: str
+    fetch_mode: str
+
+    def __init__(self, name: str, sql: str, fetch_mode: str):
+        self.name = name
+        self.sql = sql
+        self.fetch_mode = fetch_mode
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r}, fetch_mode={self.fetch_mode!r})"
+
+
+TASK_COLUMNS = 'name, description, date, priority, status, id, rrule'
+
+
+def where_tasks(*conditions: str) -> str:
+    # conditions are joined with AND after the user filter
+    return ' AND '.join(('user_id = ?',) + conditions)
+
+
+def select_tasks(*conditions: str, order_by: str = 'priority_rank, date, id', limit: bool = False) -> str:
+    # compose a task listing query, limit adds a LIMIT ? placeholder
+    query = f"SELECT {TASK_COLUMNS} FROM tasks WHERE {where_tasks(*conditions)} ORDER BY {order_by}"
+    return f"{query} LIMIT ?" if limit else query
+
+
+def count_tasks(*conditions: str) -> str:
+    return f"SELECT COUNT(*) FROM tasks WHERE {where_tasks(*conditions)}"
+
+
+# single (non-recurring) tasks only, series rows are expanded into occurrences for bounded ranges
+SINGLE_CONDITION = 'rrule IS NULL'
+
+# keyset condition, rows after the (priority_rank, date, id) of the last row of the previous page
+AFTER_CONDITION = '(priority_rank, date, id) > (?, ?, ?)'
+
+INSERT_TASK = Statement(
+    'tasks.insert',
+    """
+    INSERT INTO tasks (name, description, date, priority, priority_rank, status, user_id, rrule, recurrence_end)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    'lastrowid'
+)
+
+SELECT_TASK = Statement(
+    'tasks.get',
+    f"SELECT {TASK_COLUMNS} FROM tasks WHERE id = ? AND user_id = ?",
+    'one'
+)
+
+
+@lru_cache(maxsize=128)
+def filtered_statement(kind: str, conditions: tuple[str, ...]) -> Statement:
+    """
+    Listing ('list'), first page ('page'), following page ('page_after') or count ('count')
+    statement for TaskFilter conditions.
+
+    Built once per distinct shape of conditions, repeated listings reuse the same SQL text.
+    """
+    if kind == 'list':
+        return Statement('tasks.list', select_tasks(*conditions), 'all')
+    if kind == 'page':
+        return Statement('tasks.page', select_tasks(*conditions, limit=True), 'all')
+    if kind == 'page_after':
+        return Statement('tasks.page_after', select_tasks(AFTER_CONDITION, *conditions, limit=True), 'all')
+    if kind == 'count':
+        return Statement('tasks.count', count_tasks(*conditions), 'one')
+    raise ValueError(f"Unknown statement kind {kind!r}")
+
+
+# ranked full-text match, parameters (match expression, user_id, candidates, limit); bm25 is only computed
+# for the user's newest candidates matches, ranking every match of a short prefix costs ~200 ms at 200k tasks
+SEARCH_TASKS = Statement(
+    'tasks.search',
+    """
+    SELECT tasks.name, tasks.description, tasks.date, tasks.priority, tasks.status, tasks.id, tasks.rrule
+    FROM (
+        SELECT tasks_fts.rowid AS id, tasks_fts.rank AS rank
+        FROM tasks_fts JOIN tasks AS owned ON owned.id = tasks_fts.rowid
+        WHERE tasks_fts MATCH ? AND owned.user_id = ?
+        ORDER BY tasks_fts.rowid DESC
+        LIMIT ?
+    ) AS hits
+    JOIN tasks ON tasks.id = hits.id
+    ORDER BY hits.rank
+    LIMIT ?
+    """,
+    'all'
+)
+
+# per day, status and priority task counts of a half-open day range, read from the trigger-kept summary table
+DAY_COUNTS = Statement(
+    'task_day_counts.range',
+    """
+    SELECT day, status, priority, count FROM task_day_counts
+    WHERE user_id = ? AND day >= ? AND day < ?
+    ORDER BY day
+    """,
+    'all'
+)
+
+# series with an occurrence that can fall in [start, end), scheduled there or moved there by an override,
+# parameters (user_id, end, start, start, end)
+SELECT_SERIES = Statement(
+    'tasks.series',
+    f"""
+    SELECT {TASK_COLUMNS} FROM tasks
+    WHERE user_id = ? AND rrule IS NOT NULL AND (
+        (date < ? AND (recurrence_end IS NULL OR recurrence_end >= ?))
+        OR id IN (SELECT task_id FROM task_occurrences WHERE date >= ? AND date < ?)
+    )
+    """,
+    'all'
+)
+
+# overrides of occurrences scheduled or moved into [start, end), parameters (user_id, start, end, start, end)
+SELECT_OCCURRENCES = Statement(
+    'task_occurrences.range',
+    """
+    SELECT task_id, occurrence, name, description, date, priority, status FROM task_occurrences
+    WHERE task_id IN (SELECT id FROM tasks WHERE user_id = ? AND rrule IS NOT NULL)
+    AND ((occurrence >= ? AND occurrence < ?) OR (date >= ? AND date < ?))
+    """,
+    'all'
+)
+
+# fields left NULL keep the value of the series or of an earlier override
+UPSERT_OCCURRENCE = Statement(
+    'task_occurrences.upsert',
+    """
+    INSERT INTO task_occurrences (task_id, occurrence, name, description, date, priority, status)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (task_id, occurrence) DO UPDATE SET
+        name = coalesce(excluded.name, name),
+        description = coalesce(excluded.description, description),
+        date = coalesce(excluded.date, date),
+        priority = coalesce(excluded.priority, priority),
+        status = coalesce(excluded.status, status)
+    """,
+    'none'
+)
+
+# date an earlier override moved the occurrence to, parameters (task_id, occurrence)
+SELECT_OCCURRENCE_DATE = Statement(
+    'task_occurrences.get_date',
+    'SELECT date FROM task_occurrences WHERE task_id = ? AND occurrence = ?',
+    'one'
+)
+
+SELECT_SERIES_RULE = Statement(
+    'tasks.get_rule',
+    'SELECT rrule, date FROM tasks WHERE id = ? AND user_id = ?',
+    'one'
+)
+
+UPDATE_SERIES_RULE = Statement(
+    'tasks.update_rule',
+    'UPDATE tasks SET rrule = ?, recurrence_end = ? WHERE id = ? AND user_id = ?',
+    'rowcount'
+)
+
+SELECT_TASK_DATE = Statement('tasks.get_date', 'SELECT date, rrule FROM tasks WHERE id = ?', 'one')
+
+UPDATE_TASK = Statement(
+    'tasks.update',
+    """
+    UPDATE tasks
+    SET name = ?, description = ?, date = ?, priority = ?, priority_rank = ?, status = ?
+    WHERE id = ? AND user_id = ?
+    """,
+    'none'
+)
+
+DELETE_TASK = Statement('tasks.delete', 'DELETE FROM tasks WHERE id = ?', 'none')
+
+COMPLETE_TASK = Statement('tasks.complete', "UPDATE tasks SET status = 'Completed' WHERE id = ?", 'none')
+
+# bulk variants take (id, user_id) per row
+DELETE_USER_TASK = Statement('tasks.delete_for_user', 'DELETE FROM tasks WHERE id = ? AND user_id = ?', 'rowcount')
+
+COMPLETE_USER_TASK = Statement(
+    'tasks.complete_for_user',
+    "UPDATE tasks SET status = 'Completed' WHERE id = ? AND user_id = ?",
+    'rowcount'
+)
@@ -0,0 +1,98 @@
+import bisect
+import re
+import sys
+import threading
+
+
+class StatementStats:
+    # latency histogram and totals of one SQL text
+    __slots__ = ('calls', 'errors', 'rows', 'total_ms', 'max_ms', 'buckets')
+
+    def __init__(self, bucket_count: int):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * bucket_count
+
+
+class QueryStats:
+    """
+    Opt-in per statement instrumentation of ContextManager.
+
+    Statements are keyed by their SQL text with whitespace collapsed, so every
+    named statement of Controllers.queries gets its own entry.
+    """
+    # upper bounds of the latency histogram buckets in milliseconds, the last bucket takes the rest
+    BUCKETS_MS: tuple[float, ...] = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000)
+    __WHITESPACE: re.Pattern = re.compile(r'\s+')
+
+    slow_query_ms: float | None
+
+    def __init__(self, slow_query_ms: float | None = None):
+        """
+        :param slow_query_ms: statements slower than this are reported with their query plan, None never
+        """
+        self.slow_query_ms = slow_query_ms
+        self.__statements: dict[str, StatementStats] = {}
+        self.__keys: dict[str, str] = {}
+        self.__lock = threading.Lock()
+
+    def key(self, query: str) -> str:
+        # normalize each distinct query text only once
+        key = self.__keys.get(query)
+        if key is None:
+            key = self.__keys[query] = self.__WHITESPACE.sub(' ', query).strip()
+        return key
+
+    def record(self, query: str, elapsed_ms: float, rows: int = 0, failed: bool = False):
+        key = self.key(query)
+        with self.__lock:
+            statement = self.__statements.get(key)
+            if statement is None:
+                statement = self.__statements[key] = StatementStats(len(self.BUCKETS_MS) + 1)
+
+            statement.calls += 1
+            statement.errors += failed
+            statement.rows += rows
+            statement.total_ms += elapsed_ms
+            statement.max_ms = max(statement.max_ms, elapsed_ms)
+            statement.buckets[bisect.bisect_left(self.BUCKETS_MS, elapsed_ms)] += 1
+
+    def is_slow(self, elapsed_ms: float) -> bool:
+        return self.slow_query_ms is not None and elapsed_ms >= self.slow_query_ms
+
+    def report_slow(self, query: str, elapsed_ms: float, plan: list | None):
+        # diagnostics go to stderr, stdout may be a machine readable stream
+        print(f"SQLite slow query ({elapsed_ms:.1f} ms): {self.key(query)}", file=sys.stderr)
+        for row in plan or ():
+            # EXPLAIN QUERY PLAN rows are (id, parent, notused, detail)
+            print(f"    {row[-1]}", file=sys.stderr)
+
+    def snapshot(self) -> dict:
+        """
+        Copy of the collected stats, slowest total time first.
+
+        :return: dict mapping SQL text to calls, errors, rows, total/mean/max ms and
+            the histogram as {'<=bound ms': calls}
+        """
+        labels = [f'<={bound}ms' for bound in self.BUCKETS_MS] + [f'>{self.BUCKETS_MS[-1]}ms']
+        with self.__lock:
+            statements = sorted(self.__statements.items(), key=lambda item: item[1].total_ms, reverse=True)
+            return {
+                key: {
+                    'calls': statement.calls,
+                    'errors': statement.errors,
+                    'rows': statement.rows,
+                    'total_ms': statement.total_ms,
+                    'mean_ms': statement.total_ms / statement.calls,
+                    'max_ms': statement.max_ms,
+                    'histogram': dict(zip(labels, statement.buckets))
+                }
+                for key, statement in statements
+            }
+
+    def reset(self):
+        with self.__lock:
+            self.__statements.clear()
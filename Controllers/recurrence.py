@@ -0,0 +1,125 @@
+import re
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import dropwhile, islice, takewhile
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from dateutil.rrule import rrule as RecurrenceRule
+
+# occurrences expanded for a single series and range at most, guards against minutely rules over long ranges;
+# a series with COUNT is only expanded up to its MAX_OCCURRENCES first occurrences
+MAX_OCCURRENCES = 10000
+
+# length of one period per dateutil frequency, YEARLY (0) to SECONDLY (6), None for calendar periods
+_PERIODS: tuple[timedelta | None, ...] = (
+    None, None, timedelta(weeks=1), timedelta(days=1), timedelta(hours=1), timedelta(minutes=1), timedelta(seconds=1)
+)
+_YEARLY = 0
+
+# task dates are naive local times, a UTC 'Z' UNTIL would not compare against them
+_UTC_UNTIL = re.compile(r'(UNTIL=\d{8}(?:T\d{6})?)Z', re.IGNORECASE)
+_BOUNDED = re.compile(r'\b(UNTIL|COUNT)=', re.IGNORECASE)
+_COUNTED = re.compile(r'\bCOUNT=', re.IGNORECASE)
+
+
+def normalize_rule(rule: str) -> str:
+    # 'RRULE:' prefix and surrounding whitespace dropped, the stored form
+    rule = rule.strip()
+    if rule.upper().startswith('RRULE:'):
+        rule = rule[len('RRULE:'):]
+    return _UTC_UNTIL.sub(r'\1', rule)
+
+
+@lru_cache(maxsize=1024)
+def parse_rule(rule: str, start: datetime) -> 'RecurrenceRule':
+    """
+    Recurrence rule of a series starting at start, parsed once per series.
+
+    :raises ValueError: when rule is not a single valid RRULE
+    """
+    # imported with the first series, startup and agendas without recurring tasks never load dateutil
+    from dateutil.rrule import rrule as RecurrenceRule, rrulestr
+
+    try:
+        parsed = rrulestr(normalize_rule(rule), dtstart=start)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid recurrence rule {rule!r}: {e}") from e
+
+    if not isinstance(parsed, RecurrenceRule):
+        raise ValueError(f"Invalid recurrence rule {rule!r}: only one RRULE is supported")
+    return parsed
+
+
+def series_end(rule: str, start: datetime) -> datetime | None:
+    """
+    Latest start of an occurrence, None for rules without UNTIL or COUNT.
+
+    Only used to skip ended series, so a long series with UNTIL gets it as an upper bound
+    instead of being expanded occurrence by occurrence.
+    """
+    if not _BOUNDED.search(rule):
+        return None
+
+    parsed = parse_rule(rule, start)
+    expanded = list(islice(parsed, MAX_OCCURRENCES + 1))
+    if _COUNTED.search(rule) or len(expanded) <= MAX_OCCURRENCES:
+        return expanded[min(len(expanded), MAX_OCCURRENCES) - 1] if expanded else start
+
+    # dateutil keeps the parsed UNTIL, the rule has no public accessor for it
+    return parsed._until
+
+
+def occurrences(rule: str, start: datetime, range_start: datetime, range_end: datetime) -> Iterator[datetime]:
+    # occurrence starts in [range_start, range_end), generated on demand from the first one in range
+    in_range = takewhile(lambda occurrence: occurrence < range_end, _upcoming(rule, start, range_start))
+    return islice(in_range, MAX_OCCURRENCES)
+
+
+def is_occurrence(rule: str, start: datetime, occurrence: datetime) -> bool:
+    return next(_upcoming(rule, start, occurrence), None) == occurrence
+
+
+def _upcoming(rule: str, start: datetime, moment: datetime) -> Iterator[datetime]:
+    # occurrences from moment on; dateutil generates a series from its start, so the start is moved up first
+    parsed = parse_rule(rule, start)
+    if _COUNTED.search(rule):
+        # the count depends on every earlier occurrence, recurrence_end keeps ended series from getting here
+        return dropwhile(lambda occurrence: occurrence < moment, islice(parsed, MAX_OCCURRENCES))
+
+    aligned = _aligned_start(parsed, start, moment)
+    if aligned != start:
+        parsed = parsed.replace(dtstart=aligned)
+    return parsed.xafter(moment, inc=True)
+
+
+def _aligned_start(parsed: 'RecurrenceRule', start: datetime, moment: datetime) -> datetime:
+    """
+    Latest date up to moment a whole number of intervals after start, start if there is none.
+
+    The rule derives the same defaults (weekday, day of month, time) from it and produces
+    the same occurrences from it on.
+    """
+    if moment <= start:
+        return start
+
+    # dateutil's own frequency and interval, replace() reads them the same way
+    frequency, interval = parsed._freq, parsed._interval
+    period = _PERIODS[frequency]
+    if period is not None:
+        return start + (moment - start) // (period * interval) * interval * period
+
+    months = 12 * interval if frequency == _YEARLY else interval
+    steps = ((moment.year - start.year) * 12 + moment.month - start.month) // months
+    while steps > 0:
+        month = start.month - 1 + steps * months
+        try:
+            aligned = start.replace(year=start.year + month // 12, month=month % 12 + 1)
+        except ValueError:
+            # the day of start does not exist in that month, an earlier interval is taken
+            aligned = None
+        if aligned is not None and aligned <= moment:
+            return aligned
+        steps -= 1
+    return start
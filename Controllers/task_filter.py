@@ -0,0 +1,201 @@
+import re
+import unicodedata
+from collections.abc import Iterable
+from datetime import datetime, date as date_type, time, timedelta
+
+from Models.task import Task
+
+_WORD = re.compile(r'[^\W_]+')
+
+
+class TaskFilter:
+    # which tasks a listing or count covers, compiled to indexed SQL conditions by conditions();
+    # immutable, it is part of AgendaCache keys
+    __slots__ = ('__statuses', '__priorities', '__start', '__end', '__text', '__key', '__conditions')
+
+    ACTIVE_STATUSES: tuple[str, ...] = ('Pending', 'In Progress', 'On Hold')
+
+    __statuses: tuple[str, ...] | None
+    __priorities: tuple[str, ...] | None
+    __start: datetime | None
+    __end: datetime | None
+    __text: str | None
+    __key: tuple
+    __conditions: tuple[tuple[str, ...], tuple] | None
+
+    def __init__(
+        self,
+        statuses: Iterable[str] | None = None,
+        priorities: Iterable[str] | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        text: str | None = None
+    ):
+        """
+        :param statuses: only these statuses, None for all
+        :param priorities: only these priorities, None for all
+        :param start: inclusive lower bound of the task date
+        :param end: exclusive upper bound of the task date
+        :param text: words, each the start of a word of the name or description, matched through tasks_fts
+        """
+        self.__statuses = tuple(sorted(set(statuses))) if statuses is not None else None
+        self.__priorities = tuple(sorted(set(priorities))) if priorities is not None else None
+        self.__start = start
+        self.__end = end
+        self.__text = text.strip() or None if text else None
+        self.__key = (self.__statuses, self.__priorities, self.__start, self.__end, self.__text)
+        self.__conditions = None
+
+    @property
+    def statuses(self) -> tuple[str, ...] | None:
+        return self.__statuses
+
+    @property
+    def priorities(self) -> tuple[str, ...] | None:
+        return self.__priorities
+
+    @property
+    def start(self) -> datetime | None:
+        return self.__start
+
+    @property
+    def end(self) -> datetime | None:
+        return self.__end
+
+    @property
+    def text(self) -> str | None:
+        return self.__text
+
+    @classmethod
+    def for_day(cls, day: str | date_type, **kwargs) -> 'TaskFilter':
+        # day is a date or 'YYYY-MM-DD', covers [day, next day)
+        if isinstance(day, str):
+            day = datetime.strptime(day, "%Y-%m-%d").date()
+        start = datetime.combine(day, time())
+        return cls(start=start, end=start + timedelta(days=1), **kwargs)
+
+    def key(self) -> tuple:
+        return self.__key
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, TaskFilter) and self.key() == other.key()
+
+    def __hash__(self) -> int:
+        return hash(self.key())
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(statuses={self.statuses!r}, priorities={self.priorities!r}, "
+            f"start={self.start!r}, end={self.end!r}, text={self.text!r})"
+        )
+
+    def conditions(self) -> tuple[tuple[str, ...], tuple]:
+        """
+        SQL conditions and their parameters, the condition text only depends on which fields are set
+        and how many values they hold, so compiled statements can be reused.
+
+        Built on the first call, the filter does not change afterwards.
+        """
+        if self.__conditions is None:
+            self.__conditions = self.__compile()
+        return self.__conditions
+
+    def __compile(self) -> tuple[tuple[str, ...], tuple]:
+        conditions = []
+        params = []
+
+        if self.is_single_day():
+            # equality on the generated day column, the (user_id, day, priority_rank, date, id) index
+            # returns the rows already sorted
+            conditions.append('day = ?')
+            params.append(self.start.strftime("%Y-%m-%d"))
+        else:
+            # bare date column, range seek on the (user_id, date, priority_rank) index
+            if self.start is not None:
+                conditions.append('date >= ?')
+                params.append(self.__bound(self.start))
+            if self.end is not None:
+                conditions.append('date < ?')
+                params.append(self.__bound(self.end))
+
+        if self.statuses is not None:
+            conditions.append(f"status IN ({', '.join('?' * len(self.statuses))})")
+            params.extend(self.statuses)
+        if self.priorities is not None:
+            conditions.append(f"priority IN ({', '.join('?' * len(self.priorities))})")
+            params.extend(self.priorities)
+
+        if self.text is not None:
+            # word prefixes looked up in the full-text index, a LIKE '%text%' would scan every row of the user
+            expression = self.match_expression(self.text)
+            if expression is None:
+                conditions.append('0')
+            else:
+                conditions.append('id IN (SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ?)')
+                params.append(expression)
+
+        return tuple(conditions), tuple(params)
+
+    def matches(self, task: Task) -> bool:
+        # the same filter applied in Python, for tasks changed in place
+        if self.statuses is not None and task.status not in self.statuses:
+            return False
+        if self.priorities is not None and task.priority not in self.priorities:
+            return False
+
+        task_date = task.get_datetime()
+        if self.start is not None and task_date < self.start:
+            return False
+        if self.end is not None and task_date >= self.end:
+            return False
+
+        if self.text is not None:
+            # the index' unicode61 tokenizer: case and diacritics folded, split on anything but letters and digits
+            # text without a single word matches nothing, like its '0' condition
+            prefixes = self.words(self.text)
+            words = self.words(f"{task.name or ''} {task.description or ''}")
+            return bool(prefixes) and all(any(word.startswith(prefix) for word in words) for prefix in prefixes)
+        return True
+
+    @staticmethod
+    def words(text: str) -> list[str]:
+        folded = unicodedata.normalize('NFKD', text.casefold())
+        return _WORD.findall(''.join(char for char in folded if not unicodedata.combining(char)))
+
+    @classmethod
+    def match_expression(cls, text: str) -> str | None:
+        # user text to an FTS5 expression: every word quoted (no operator injection) and prefix matched
+        words = cls.words(text)
+        if not words:
+            return None
+        return ' '.join(f'"{word}"*' for word in words)
+
+    def is_single_day(self) -> bool:
+        # exactly one calendar day, from midnight to the next midnight
+        return (
+            self.start is not None and self.end is not None
+            and self.start.time() == time() and self.end == self.start + timedelta(days=1)
+        )
+
+    def is_bounded(self) -> bool:
+        # a finite date range, recurring tasks are expanded only for those
+        return self.start is not None and self.end is not None
+
+    def includes_day(self, day: str | None) -> bool:
+        # whether a change of a task on day ('YYYY-MM-DD', None if unknown) can affect this filter
+        if day is None:
+            return True
+
+        day_start = datetime.strptime(day, "%Y-%m-%d")
+        day_end = day_start + timedelta(days=1)
+        return (
+            (self.start is None or self.start < day_end)
+            and (self.end is None or self.end > day_start)
+        )
+
+    @staticmethod
+    def __bound(value: datetime) -> str:
+        # midnight bounds as 'YYYY-MM-DD', which also sorts before dates stored without a time
+        if value.time() == time():
+            return value.strftime("%Y-%m-%d")
+        return value.isoformat(' ', 'seconds')
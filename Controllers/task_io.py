@@ -0,0 +1,148 @@
+"""
+Streaming task import and export in CSV and JSON Lines.
+
+Readers and writers work on open text streams one record at a time, imports
+are inserted chunk by chunk, so memory stays flat whatever the file size.
+"""
+import csv
+import json
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+from typing import TextIO
+
+from Controllers import recurrence
+from Controllers.agenda_controller import AgendaController
+from Controllers.task_filter import TaskFilter
+from Models.task import Task
+
+FORMATS: tuple[str, ...] = ('jsonl', 'csv')
+FIELDS: tuple[str, ...] = ('id', 'name', 'description', 'date', 'priority', 'status', 'rrule')
+CHUNK_SIZE = 10000
+PAGE_SIZE = 1000
+
+
+def guess_format(path: str, default: str = 'jsonl') -> str:
+    # by file extension, .ndjson and .jsonl are both JSON Lines
+    if path.lower().endswith('.csv'):
+        return 'csv'
+    return default
+
+
+def read_records(stream: TextIO, file_format: str) -> Iterator[tuple[int, dict | str]]:
+    """
+    Yield (line number, record) pairs, the record is a dict for CSV and the raw line for JSON Lines.
+
+    JSON is decoded by import_tasks so a broken line is reported instead of stopping the import.
+    """
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif file_format == 'jsonl':
+        for number, line in enumerate(stream, start=1):
+            if line.strip():
+                yield number, line
+    else:
+        raise ValueError(f"Unknown format {file_format!r}")
+
+
+def import_tasks(
+    agenda: AgendaController,
+    records: Iterable[tuple[int, dict | str]],
+    chunk_size: int = CHUNK_SIZE,
+    progress: Callable[[int, int], None] | None = None,
+    on_error: Callable[[dict], None] | None = None
+) -> dict:
+    """
+    Insert records as tasks of agenda's user, chunk_size per transaction.
+
+    :param records: (line number, record) pairs, see read_records
+    :param progress: called with the imported and failed counts after every chunk
+    :param on_error: called with a failure dict for every record that was not imported
+    :return: dict with the imported and failed counts
+    """
+    imported = failed = 0
+    records = iter(records)
+
+    while chunk := list(islice(records, chunk_size)):
+        tasks = []
+        for number, record in chunk:
+            try:
+                if isinstance(record, str):
+                    record = json.loads(record)
+                task = Task.from_dict(record)
+                if task.rrule:
+                    # checked per record, a bad rule would otherwise fail its whole chunk
+                    recurrence.parse_rule(task.rrule, task.get_datetime())
+                tasks.append(task)
+            except (ValueError, TypeError, AttributeError) as e:
+                failed += 1
+                if on_error is not None:
+                    on_error({'success': False, 'line': number, 'message': str(e)})
+
+        response = agenda.insert_tasks(tasks) if tasks else {'success': True, 'count': 0}
+        if response['success']:
+            imported += response['count']
+        else:
+            failed += len(tasks)
+            if on_error is not None:
+                on_error({'success': False, 'lines': [chunk[0][0], chunk[-1][0]], 'message': response['message']})
+
+        if progress is not None:
+            progress(imported, failed)
+
+    return {
+        'success': failed == 0,
+        'imported': imported,
+        'failed': failed
+    }
+
+
+def iter_tasks(agenda: AgendaController, task_filter: TaskFilter | None = None, page_size: int = PAGE_SIZE) -> Iterator[Task]:
+    # every matching task, fetched by keyset pages
+    cursor = None
+    while True:
+        response = agenda.get_tasks_page(task_filter, cursor, page_size)
+        if not response['success']:
+            raise RuntimeError(response['message'])
+
+        yield from response['tasks']
+        if not response['has_more']:
+            return
+        cursor = response['cursor']
+
+
+def export_tasks(
+    tasks: Iterable[Task],
+    stream: TextIO,
+    file_format: str,
+    progress: Callable[[int], None] | None = None,
+    progress_every: int = CHUNK_SIZE
+) -> int:
+    """
+    Write tasks to stream as CSV with a header row or as JSON Lines.
+
+    :param progress: called with the number of tasks written every progress_every tasks and at the end
+    :return: the number of tasks written
+    """
+    if file_format == 'csv':
+        # exported series are listed once, without an occurrence
+        writer = csv.DictWriter(stream, FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        write = writer.writerow
+    elif file_format == 'jsonl':
+        def write(record: dict):
+            stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+    else:
+        raise ValueError(f"Unknown format {file_format!r}")
+
+    written = 0
+    for task in tasks:
+        write(task.to_dict())
+        written += 1
+        if progress is not None and written % progress_every == 0:
+            progress(written)
+
+    if progress is not None:
+        progress(written)
+    return written
@@ -2,13 +2,13 @@ from Models.user import User
 from Controllers.context_manager import ContextManager
 
 class UserController:
-    def __init__(self):
-        self.db = ContextManager()
+    def __init__(self, db: ContextManager | None = None):
+        self.db = db or ContextManager.shared()
 
     def get_user(self, user_id):
         raw_student = self.db.execute(
             "SELECT first_name, last_name, id FROM users WHERE id = ?",
-            (1, ),
+            (user_id, ),
             fetch_mode='one'
         )
 
@@ -22,3 +22,21 @@ class UserController:
             'success': False,
             'message': "User not found!"
         }
+
+    def add_user(self, first_name: str, last_name: str) -> dict:
+        identifier = self.db.execute(
+            "INSERT INTO users (first_name, last_name) VALUES (?, ?)",
+            (first_name, last_name),
+            fetch_mode='lastrowid'
+        )
+
+        if not identifier:
+            return {
+                'success': False,
+                'message': 'Something went wrong! User could not be created'
+            }
+
+        return {
+            'success': True,
+            'user': User(first_name, last_name, identifier=identifier)
+        }
@@ -1,37 +1,105 @@
-from datetime import datetime, timedelta
+from datetime import datetime, date as date_type, timedelta
 
 
 class Task:
+    __slots__ = ('__id', '__name', '__description', '__priority', '__date', '__status', '__datetime', '__rrule', '__occurrence')
+
+    __id: int | None
     __name: str
     __description: str
     __priority: str
-    __date: datetime
+    __date: datetime | str
     __status: str
-    __status: tuple[str]
+    __datetime: datetime | None
+    __rrule: str | None
+    __occurrence: datetime | None
     __STATUSES: tuple[str, ...] = ("Pending", "In Progress", "Completed", "On Hold", "Cancelled")
     __PRIORITIES: tuple[str, ...] = ('Low', 'Medium', 'High', 'Critical')
-    __READABLE: tuple[str, ...] = ('id', 'name', 'description', 'priority', 'date', 'status')
-
-    def __init__(self, name: str, description: str, date: datetime = datetime.now(), priority: str = 1, status: str = "Pending", identifier: int = None):
+    # sort order of priorities, stored as tasks.priority_rank so listings can be ordered by an index
+    __PRIORITY_RANKS: dict[str, int] = {'Critical': 1, 'High': 2, 'Medium': 3, 'Low': 4}
+    __UNKNOWN_PRIORITY_RANK: int = 5
+
+    # (background, text) colors, shared by every instance
+    DEFAULT_COLOR: tuple[str, str] = ("rgba(255, 255, 255, 0.1)", "white")
+    STATUS_COLORS: dict[str, tuple[str, str]] = {
+        "Pending": ("rgba(63, 63, 63, 0.8)", "lightgray"),  # Dark gray background, light gray text
+        "Completed": ("rgba(46, 77, 46, 0.8)", "lightgreen"),  # Dark green background, light green text
+        "Cancelled": ("rgba(77, 46, 46, 0.8)", "lightcoral"),  # Dark red background, light coral text
+        "In Progress": ("rgba(77, 63, 46, 0.8)", "wheat"),  # Warm brown background, wheat-colored text
+        "On Hold": ("rgba(46, 59, 77, 0.8)", "lightskyblue"),  # Dark blue-gray background, sky blue text
+    }
+    PRIORITY_COLORS: dict[str, tuple[str, str]] = {
+        "Low": ("rgba(255, 255, 255, 0.1)", "white"),  # Low priority: Light background, white text
+        "Medium": ("rgba(46, 59, 77, 0.8)", "lightskyblue"),  # Medium priority: Darker blue-gray, light blue text
+        "High": ("rgba(255, 165, 0, 0.3)", "rgba(204, 102, 0, 0.8)"),  # High priority: Orange background, darker orange text
+        "Critical": ("rgba(77, 46, 46, 0.8)", "lightcoral"),  # Critical priority: Dark red background, light coral text
+    }
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        date: datetime = datetime.now(),
+        priority: str = 1,
+        status: str = "Pending",
+        identifier: int = None,
+        rrule: str | None = None,
+        occurrence: datetime | None = None
+    ):
+        """
+        :param rrule: RRULE text (e.g. 'FREQ=WEEKLY;BYDAY=MO') of a recurring series starting at date
+        :param occurrence: for one expanded occurrence of a series (identifier), its scheduled start
+        """
         self.__id = identifier
         self.__name = name
         self.__description = description
         self.__priority = priority
         self.__date = date
         self.__status = status
-
-    # return private attributes
-    def __getattr__(self, attr):
-        protected = f"_{self.__class__.__name__}__{attr}"
-
-        # check if attr isset and not in
-        if attr in self.__READABLE and protected in self.__dict__:
-            return self.__dict__[protected]
-        raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{attr}'")
+        # parsed on first use, see get_datetime
+        self.__datetime = date if isinstance(date, datetime) else None
+        self.__rrule = rrule
+        self.__occurrence = occurrence
 
     # represent instance
     def __repr__(self) -> str:
-        return "{}({})".format(type(self).__name__, ", ".join([f"{key}={value!r}" for key, value in self.__dict__.items()]))
+        return (
+            f"{type(self).__name__}(id={self.__id!r}, name={self.__name!r}, description={self.__description!r}, "
+            f"priority={self.__priority!r}, date={self.__date!r}, status={self.__status!r}, "
+            f"rrule={self.__rrule!r}, occurrence={self.__occurrence!r})"
+        )
+
+    @property
+    def id(self) -> int | None:
+        return self.__id
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def description(self) -> str:
+        return self.__description
+
+    @property
+    def priority(self) -> str:
+        return self.__priority
+
+    @property
+    def date(self) -> datetime | str:
+        return self.__date
+
+    @property
+    def status(self) -> str:
+        return self.__status
+
+    @property
+    def rrule(self) -> str | None:
+        return self.__rrule
+
+    @property
+    def occurrence(self) -> datetime | None:
+        return self.__occurrence
 
     @classmethod
     def statuses(cls):
@@ -41,29 +109,18 @@ class Task:
     def priorities(cls):
         return cls.__PRIORITIES
 
+    @classmethod
+    def priority_rank(cls, priority: str) -> int:
+        return cls.__PRIORITY_RANKS.get(priority, cls.__UNKNOWN_PRIORITY_RANK)
+
     @property
     def status_color(self):
-        colors = {
-            "Pending": ("rgba(63, 63, 63, 0.8)", "lightgray"),  # Dark gray background, light gray text
-            "Completed": ("rgba(46, 77, 46, 0.8)", "lightgreen"),  # Dark green background, light green text
-            "Cancelled": ("rgba(77, 46, 46, 0.8)", "lightcoral"),  # Dark red background, light coral text
-            "In Progress": ("rgba(77, 63, 46, 0.8)", "wheat"),  # Warm brown background, wheat-colored text
-            "On Hold": ("rgba(46, 59, 77, 0.8)", "lightskyblue"),  # Dark blue-gray background, sky blue text
-        }
-
-        return colors.get(self.__status, ("rgba(255, 255, 255, 0.1)", "white"))
+        return self.STATUS_COLORS.get(self.__status, self.DEFAULT_COLOR)
 
     @property
     def priority_color(self):
-        colors = {
-            "Low": ("rgba(255, 255, 255, 0.1)", "white"),  # Low priority: Light background, white text
-            "Medium": ("rgba(46, 59, 77, 0.8)", "lightskyblue"),  # Medium priority: Darker blue-gray, light blue text
-            "High": ("rgba(255, 165, 0, 0.3)", "rgba(204, 102, 0, 0.8)"),  # High priority: Orange background, darker orange text
-            "Critical": ("rgba(77, 46, 46, 0.8)", "lightcoral"),  # Critical priority: Dark red background, light coral text
-        }
-
         # Ensure only valid priorities are used; fallback for invalid priority
-        return colors.get(self.__priority,("rgba(255, 255, 255, 0.1)", "white"))
+        return self.PRIORITY_COLORS.get(self.__priority, self.DEFAULT_COLOR)
 
     def set_status(self, status: str):
         if status in self.__STATUSES:
@@ -73,24 +130,68 @@ class Task:
 
     @property
     def task_time_label(self):
-        current_date = datetime.now()
-        task_date = self.get_datetime()
+        current_date = date_type.today()
+        task_date = self.get_datetime().date()
 
         # Compare the task date with the current date
-        if task_date.date() == current_date.date():
+        if task_date == current_date:
             time_label_text = 'Today'
-        elif task_date.date() == (current_date + timedelta(days=1)).date():
+        elif task_date == current_date + timedelta(days=1):
             time_label_text = 'Tomorrow'
-        elif task_date.date() < current_date.date():
+        elif task_date < current_date:
             time_label_text = 'Passed'
         else:
             time_label_text = task_date.strftime('%d-%m-%Y')
 
         return time_label_text
 
-    def get_datetime(self):
-        # Convert task.date string to QDateTime
-        try:
-            return datetime.strptime(self.date, "%Y-%m-%d %H:%M:%S.%f")
-        except ValueError:
-            return datetime.strptime(self.date, "%Y-%m-%d %H:%M:%S")
\ No newline at end of file
+    def to_dict(self) -> dict:
+        # plain JSON values, the date in the stored 'YYYY-MM-DD HH:MM:SS' format
+        return {
+            'id': self.__id,
+            'name': self.__name,
+            'description': self.__description,
+            'date': self.get_datetime().isoformat(' ', 'seconds'),
+            'priority': self.__priority,
+            'status': self.__status,
+            'rrule': self.__rrule,
+            'occurrence': self.__occurrence.isoformat(' ', 'seconds') if self.__occurrence else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Task':
+        """
+        Build a task from to_dict() style values, id is optional.
+        A date with a UTC offset is converted to local time.
+
+        :raises ValueError: on a missing name, an unknown priority or status or an unparsable date
+        """
+        name = data.get('name')
+        if not name:
+            raise ValueError("Task name is required")
+
+        priority = data.get('priority') or 'Low'
+        if priority not in cls.__PRIORITIES:
+            raise ValueError(f"Unexpected priority {priority!r}")
+
+        status = data.get('status') or 'Pending'
+        if status not in cls.__STATUSES:
+            raise ValueError(f"Unexpected status {status!r}")
+
+        date = data.get('date')
+        date = datetime.fromisoformat(str(date)) if date else datetime.now().replace(microsecond=0)
+        if date.tzinfo is not None:
+            # dates are stored as naive local time, an offset would be dropped by the text comparisons
+            date = date.astimezone().replace(tzinfo=None)
+
+        return cls(
+            name, data.get('description') or '', date, priority, status,
+            identifier=data.get('id'), rrule=data.get('rrule') or None
+        )
+
+    def get_datetime(self) -> datetime:
+        # dates loaded from the database are already datetimes, only a text date is parsed (once)
+        if self.__datetime is None:
+            self.__datetime = datetime.fromisoformat(self.__date)
+
+        return self.__datetime
@@ -0,0 +1,82 @@
+from collections.abc import Callable
+from itertools import count
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+
+class QueryWorker(QRunnable):
+    def __init__(self, loader: 'AgendaLoader', request_id: int, channel: str | None, function: Callable, args, kwargs):
+        super().__init__()
+        self.loader = loader
+        self.request_id = request_id
+        self.channel = channel
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        # a newer request on the same channel was queued meanwhile, don't touch the database
+        if self.loader.is_stale(self.request_id, self.channel):
+            self.loader.done.emit(self.request_id, None)
+            return
+
+        try:
+            result = self.function(*self.args, **self.kwargs)
+        except Exception as e:
+            result = {
+                'success': False,
+                'message': f'Something went wrong! {e}'
+            }
+
+        # queued to the loader's (GUI) thread
+        self.loader.done.emit(self.request_id, result)
+
+
+class AgendaLoader(QObject):
+    # runs controller calls off the GUI thread and hands results back through a signal
+    done = Signal(int, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # one thread keeps database calls in submission order, writes before the reads that follow them
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+
+        self.__ids = count(1)
+        self.__latest: dict[str, int] = {}
+        self.__pending: dict[int, tuple[str | None, Callable | None]] = {}
+        self.done.connect(self.__deliver)
+
+    def submit(self, channel: str | None, function: Callable, *args, callback: Callable | None = None, **kwargs) -> int:
+        """
+        Run function(*args, **kwargs) on the worker thread and pass its result to callback on the GUI thread.
+
+        :param channel: requests on the same channel supersede each other, None is never superseded
+        :return: the request id
+        """
+        request_id = next(self.__ids)
+        if channel is not None:
+            self.__latest[channel] = request_id
+
+        self.__pending[request_id] = (channel, callback)
+        self.pool.start(QueryWorker(self, request_id, channel, function, args, kwargs))
+        return request_id
+
+    def cancel(self, channel: str):
+        # drop everything queued or running on channel
+        self.__latest[channel] = next(self.__ids)
+
+    def is_stale(self, request_id: int, channel: str | None) -> bool:
+        return channel is not None and self.__latest.get(channel) != request_id
+
+    def wait(self, msecs: int = -1) -> bool:
+        return self.pool.waitForDone(msecs)
+
+    @Slot(int, object)
+    def __deliver(self, request_id: int, result):
+        channel, callback = self.__pending.pop(request_id, (None, None))
+
+        # results of superseded requests are dropped
+        if callback is None or self.is_stale(request_id, channel):
+            return
+        callback(result)
@@ -0,0 +1,50 @@
+from datetime import date
+
+from PySide6.QtCore import QDate
+from PySide6.QtGui import QBrush, QFont, QTextCharFormat
+from PySide6.QtWidgets import QCalendarWidget
+
+from Models.task import Task
+from Views.task_list import PRIORITY_PALETTE
+
+
+def visible_range(year: int, month: int) -> tuple[date, date]:
+    # the popup grid shows parts of the previous and next month, six weeks at most
+    first = date(year, month, 1)
+    start = date.fromordinal(first.toordinal() - 7)
+    end = date.fromordinal(first.toordinal() + 6 * 7 + 7)
+    return start, end
+
+
+class CalendarBadges:
+    # paints per-day task load on a QCalendarWidget from AgendaController.day_counts results
+
+    def __init__(self, calendar: QCalendarWidget):
+        self.calendar = calendar
+
+    def apply(self, days: dict[str, dict]):
+        # a null date resets the format of every day
+        self.calendar.setDateTextFormat(QDate(), QTextCharFormat())
+
+        for day, counts in days.items():
+            self.calendar.setDateTextFormat(QDate.fromString(day, 'yyyy-MM-dd'), self.day_format(counts))
+
+    @staticmethod
+    def day_format(counts: dict) -> QTextCharFormat:
+        day_format = QTextCharFormat()
+        day_format.setToolTip(f"{counts['total']} tasks, {counts['open']} open")
+
+        if not counts['open']:
+            return day_format
+
+        # bold days with open tasks, coloured by the most urgent priority of the day
+        day_format.setFontWeight(QFont.Weight.Bold)
+        for priority in sorted(counts['open_priorities'], key=Task.priority_rank):
+            palette = PRIORITY_PALETTE.get(priority)
+            if palette is not None:
+                background, text = palette
+                day_format.setBackground(QBrush(background))
+                day_format.setForeground(QBrush(text))
+                break
+
+        return day_format
@@ -0,0 +1,134 @@
+import heapq
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from itertools import count
+
+from PySide6.QtCore import QObject, QTimer
+
+from Controllers.agenda_controller import AgendaController
+from Controllers.task_filter import TaskFilter
+from Models.task import Task
+from Views.agenda_loader import AgendaLoader
+
+# reminders are loaded this far ahead, changes made by other processes show up once the window moves on
+HORIZON = timedelta(hours=1)
+
+
+class ReminderScheduler(QObject):
+    """
+    Calls notify with every open task once its date is reached.
+
+    Tasks due within HORIZON are loaded with one indexed range query into a min-heap by date,
+    a single-shot timer sleeps until the earliest of them or the end of the horizon, whichever
+    comes first, so nothing runs between reminders however many tasks there are.
+    """
+
+    def __init__(
+        self,
+        agenda: AgendaController,
+        loader: AgendaLoader,
+        notify: Callable[[Task], None],
+        horizon: timedelta = HORIZON,
+        parent=None
+    ):
+        super().__init__(parent)
+        self.agenda = agenda
+        self.loader = loader
+        self.notify = notify
+        self.horizon = horizon
+
+        # (date, sequence, key) entries, a key whose task changed since is skipped when it reaches the top
+        self.__heap: list[tuple[datetime, int, tuple]] = []
+        self.__due: dict[tuple, tuple[datetime, Task]] = {}
+        self.__sequence = count()
+        self.__loaded_from: datetime | None = None
+        self.__loaded_until: datetime | None = None
+
+        self.__timer = QTimer(self)
+        self.__timer.setSingleShot(True)
+        self.__timer.timeout.connect(self.__wake)
+
+    def reload(self, start: datetime | None = None):
+        # the open tasks and occurrences due from start (now by default) to the end of the horizon
+        self.__timer.stop()
+        # whole seconds like the stored dates, a task due on a boundary belongs to exactly one window
+        start = start or datetime.now().replace(microsecond=0)
+        end = (max(start, datetime.now()) + self.horizon).replace(microsecond=0)
+
+        self.loader.submit(
+            'reminders', self.agenda.due_tasks, start, end,
+            callback=lambda response: self.load(response, start, end)
+        )
+
+    def load(self, due_response: dict, start: datetime, end: datetime):
+        self.__loaded_from, self.__loaded_until = start, end
+        self.__heap.clear()
+        self.__due.clear()
+
+        # an empty horizon is the usual case, a failed read is retried with the next window
+        for task in due_response.get('tasks', []):
+            self.__push(task)
+
+        self.__arm()
+
+    def task_changed(self, task_id: int, task: Task | None = None):
+        """
+        Follow one created, updated, completed or deleted task without reloading.
+
+        :param task: the task as stored now, None once it was deleted
+        """
+        if self.__loaded_until is None:
+            return
+
+        # a series has any number of occurrences in the horizon, those are loaded again
+        if (task is not None and task.rrule) or any(key[1] is not None for key in self.__due if key[0] == task_id):
+            self.reload()
+            return
+
+        self.__due.pop((task_id, None), None)
+        # a task moved into the past is not announced
+        if task is not None and task.status in TaskFilter.ACTIVE_STATUSES and task.get_datetime() > datetime.now():
+            self.__push(task)
+        self.__arm()
+
+    def pending(self) -> list[Task]:
+        # reminders still to come, soonest first
+        return [task for _, task in sorted(self.__due.values(), key=lambda entry: entry[0])]
+
+    def __push(self, task: Task):
+        due = task.get_datetime()
+        if not self.__loaded_from <= due < self.__loaded_until:
+            return
+
+        key = (task.id, task.occurrence)
+        self.__due[key] = (due, task)
+        heapq.heappush(self.__heap, (due, next(self.__sequence), key))
+
+    def __next_due(self) -> datetime | None:
+        # drop superseded entries from the top, the rest wait until they get there
+        while self.__heap:
+            due, _, key = self.__heap[0]
+            entry = self.__due.get(key)
+            if entry is not None and entry[0] == due:
+                return due
+            heapq.heappop(self.__heap)
+        return None
+
+    def __arm(self):
+        # sleep until the next reminder or the end of the horizon
+        wake_at = self.__next_due() or self.__loaded_until
+        delay = (wake_at - datetime.now()).total_seconds()
+        self.__timer.start(max(0, int(delay * 1000)))
+
+    def __wake(self):
+        now = datetime.now()
+        while (due := self.__next_due()) is not None and due <= now:
+            _, _, key = heapq.heappop(self.__heap)
+            _, task = self.__due.pop(key)
+            self.notify(task)
+
+        if now >= self.__loaded_until:
+            # the next window starts where this one ended, a late wake up skips nothing
+            self.reload(self.__loaded_until)
+        else:
+            self.__arm()
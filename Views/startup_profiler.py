@@ -0,0 +1,55 @@
+import sys
+import time
+
+from PySide6.QtCore import QEvent, QObject, QTimer
+from PySide6.QtWidgets import QApplication, QWidget
+
+
+class StartupProfiler(QObject):
+    # time from process start to each startup stage of the window, for main.py --profile-startup
+
+    def __init__(self, started: float, parent=None):
+        """
+        :param started: time.perf_counter() taken before the Qt imports
+        """
+        super().__init__(parent)
+        self.started = started
+        self.stages: list[tuple[str, float]] = []
+        self.__window = None
+        self.__painted: QWidget | None = None
+
+    def mark(self, stage: str):
+        self.stages.append((stage, (time.perf_counter() - self.started) * 1000))
+
+    def watch(self, window, painted: QWidget):
+        """
+        Mark the first paint of painted and the first task listing of window, then report and quit.
+
+        :param window: MainWindow, its tasks_loaded signal ends the startup
+        :param painted: widget whose first paint event counts as the first paint
+        """
+        self.__window = window
+        self.__painted = painted
+        painted.installEventFilter(self)
+        window.tasks_loaded.connect(self.__on_tasks_loaded)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if watched is self.__painted and event.type() == QEvent.Type.Paint:
+            self.mark('first paint')
+            watched.removeEventFilter(self)
+        return False
+
+    def report(self) -> str:
+        return '\n'.join(f'{stage:<20} {milliseconds:8.1f} ms' for stage, milliseconds in self.stages)
+
+    def __on_tasks_loaded(self):
+        self.__window.tasks_loaded.disconnect(self.__on_tasks_loaded)
+        self.mark('first page')
+
+        # let the listing reach the screen before stopping
+        QTimer.singleShot(0, self.__finish)
+
+    def __finish(self):
+        self.mark('first page shown')
+        print(self.report(), file=sys.stderr)
+        QApplication.instance().quit()
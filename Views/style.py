@@ -0,0 +1,43 @@
+from Models.task import Task
+
+# labels opt in with setProperty('badge', 'status' | 'priority') and setProperty(<badge>, value)
+BADGE_BASE_RULE = """
+QLabel[badge] {
+    text-transform: uppercase;
+    font-weight: bold;
+    padding: 10px;
+    border-radius: 5px;
+}
+"""
+
+BADGE_COLOR_RULE = """
+QLabel[badge="{kind}"]{selector} {{
+    background-color: {background};
+    color: {text};
+    border: solid 1px {text};
+}}
+"""
+
+
+def badge_rules(kind: str, colors: dict[str, tuple[str, str]]) -> list[str]:
+    # fallback first, rules with the extra attribute selector are more specific and win
+    background, text = Task.DEFAULT_COLOR
+    rules = [BADGE_COLOR_RULE.format(kind=kind, selector='', background=background, text=text)]
+
+    for value, (background, text) in colors.items():
+        selector = f'[{kind}="{value}"]'
+        rules.append(BADGE_COLOR_RULE.format(kind=kind, selector=selector, background=background, text=text))
+
+    return rules
+
+
+def build_stylesheet() -> str:
+    return ''.join([
+        BADGE_BASE_RULE,
+        *badge_rules('status', Task.STATUS_COLORS),
+        *badge_rules('priority', Task.PRIORITY_COLORS),
+    ])
+
+
+# parsed once by Qt when set on the application
+APP_STYLESHEET = build_stylesheet()
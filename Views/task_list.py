@@ -0,0 +1,251 @@
+import re
+from bisect import bisect_right
+
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, QEvent, Signal
+from PySide6.QtGui import QColor, QPainter, QPen
+from PySide6.QtWidgets import QStyledItemDelegate, QStyle
+
+from Models.task import Task
+
+ITEM_HEIGHT = 50
+ITEM_SPACING = 5
+ITEM_PADDING = 15
+CHECKBOX_SIZE = 20
+NAME_MAX_LENGTH = 25
+HOVER_BG_COLOR = 'rgba(255, 255, 255, 0.15)'
+CHECKBOX_BG_COLOR = 'rgba(255, 255, 255, 0.1)'
+CHECKBOX_BORDER_COLOR = 'gray'
+SELECTED_BORDER_COLOR = 'lightgray'
+
+TaskRole = Qt.ItemDataRole.UserRole + 1
+
+_RGBA = re.compile(r'rgba\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*,\s*([\d.]+)\s*\)')
+_COLORS: dict[str, QColor] = {}
+
+
+def to_qcolor(css_color: str) -> QColor:
+    # QColor does not understand css rgba(), so parse it once and keep it
+    color = _COLORS.get(css_color)
+    if color is None:
+        match = _RGBA.fullmatch(css_color)
+        if match:
+            r, g, b, a = match.groups()
+            color = QColor(int(r), int(g), int(b), round(float(a) * 255))
+        else:
+            color = QColor(css_color)
+        _COLORS[css_color] = color
+    return color
+
+
+def to_palette(colors: dict[str, tuple[str, str]]) -> dict[str, tuple[QColor, QColor]]:
+    return {name: (to_qcolor(background), to_qcolor(text)) for name, (background, text) in colors.items()}
+
+
+# (background, text) QColors of the Task colour tables, built once for the delegate
+PRIORITY_PALETTE = to_palette(Task.PRIORITY_COLORS)
+STATUS_PALETTE = to_palette(Task.STATUS_COLORS)
+DEFAULT_PALETTE = (to_qcolor(Task.DEFAULT_COLOR[0]), to_qcolor(Task.DEFAULT_COLOR[1]))
+
+
+class TaskListModel(QAbstractListModel):
+    # the view scrolled to the end of a paged list, the owner loads the page after cursor
+    fetch_more_requested = Signal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.__tasks: list[Task] = []
+        self.__cursor: tuple | None = None
+        self.__has_more = False
+        self.__fetching = False
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        # flat list, items have no children
+        if parent.isValid():
+            return 0
+        return len(self.__tasks)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.__tasks):
+            return None
+
+        task = self.__tasks[index.row()]
+        if role == TaskRole:
+            return task
+        if role == Qt.ItemDataRole.DisplayRole:
+            return task.name
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return task.description
+        return None
+
+    def set_tasks(self, tasks: list[Task], cursor: tuple | None = None, has_more: bool = False):
+        # swap the whole data set, the view only repaints what is visible
+        self.beginResetModel()
+        self.__tasks = list(tasks)
+        self.__cursor = cursor
+        self.__has_more = has_more
+        self.__fetching = False
+        self.endResetModel()
+
+    def append_tasks(self, tasks: list[Task], cursor: tuple | None, has_more: bool):
+        # add the next page at the end
+        self.__fetching = False
+        self.__cursor = cursor
+        self.__has_more = has_more
+        if not tasks:
+            return
+
+        self.beginInsertRows(QModelIndex(), len(self.__tasks), len(self.__tasks) + len(tasks) - 1)
+        self.__tasks.extend(tasks)
+        self.endInsertRows()
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and self.__has_more and not self.__fetching
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+
+        self.__fetching = True
+        self.fetch_more_requested.emit(self.__cursor)
+
+    def task(self, row: int) -> Task:
+        return self.__tasks[row]
+
+    def row_of(self, task_id: int) -> int | None:
+        for row, task in enumerate(self.__tasks):
+            if task.id == task_id:
+                return row
+        return None
+
+    @staticmethod
+    def sort_key(task: Task) -> tuple:
+        # same order as AgendaController listings: priority_rank, date, id
+        return Task.priority_rank(task.priority), task.get_datetime(), task.id or 0
+
+    def insert_task(self, task: Task) -> int | None:
+        key = self.sort_key(task)
+
+        # past the loaded pages, it arrives with a later page
+        if self.__has_more and self.__cursor is not None and key > self.__cursor:
+            return None
+
+        # insert at the sorted position so the list doesn't need to be reloaded
+        row = bisect_right(self.__tasks, key, key=self.sort_key)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.__tasks.insert(row, task)
+        self.endInsertRows()
+        return row
+
+    def remove_task(self, task_id: int) -> bool:
+        row = self.row_of(task_id)
+        if row is None:
+            return False
+
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.__tasks[row]
+        self.endRemoveRows()
+        return True
+
+    def replace_task(self, task: Task) -> bool:
+        # update the row in place when its sort position doesn't change
+        row = self.row_of(task.id)
+        if row is None:
+            return False
+
+        key = self.sort_key(task)
+        if (
+            (row > 0 and self.sort_key(self.__tasks[row - 1]) > key)
+            or (row + 1 < len(self.__tasks) and self.sort_key(self.__tasks[row + 1]) < key)
+        ):
+            self.remove_task(task.id)
+            self.insert_task(task)
+            return True
+
+        self.__tasks[row] = task
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+        return True
+
+
+class TaskItemDelegate(QStyledItemDelegate):
+    task_clicked = Signal(object)
+    complete_clicked = Signal(object)
+
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(option.rect.width(), ITEM_HEIGHT + ITEM_SPACING)
+
+    @staticmethod
+    def item_rect(option) -> QRect:
+        # leave the spacing between rows unpainted
+        return option.rect.adjusted(0, 0, 0, -ITEM_SPACING)
+
+    @classmethod
+    def checkbox_rect(cls, option) -> QRect:
+        rect = cls.item_rect(option)
+        return QRect(
+            rect.left() + ITEM_PADDING,
+            rect.top() + (rect.height() - CHECKBOX_SIZE) // 2,
+            CHECKBOX_SIZE,
+            CHECKBOX_SIZE
+        )
+
+    def paint(self, painter, option, index):
+        task: Task = index.data(TaskRole)
+        if task is None:
+            return
+
+        rect = self.item_rect(option)
+
+        # get task colors
+        item_bg_color, item_text_color = PRIORITY_PALETTE.get(task.priority, DEFAULT_PALETTE)
+        if task.status == 'Completed':
+            item_bg_color, _ = STATUS_PALETTE.get(task.status, DEFAULT_PALETTE)
+
+        if option.state & QStyle.StateFlag.State_MouseOver:
+            item_bg_color = to_qcolor(HOVER_BG_COLOR)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.fillRect(rect, item_bg_color)
+
+        if option.state & QStyle.StateFlag.State_Selected:
+            # outline rows picked for a bulk action
+            painter.setPen(QPen(to_qcolor(SELECTED_BORDER_COLOR), 1))
+            painter.drawRect(rect.adjusted(0, 0, -1, -1))
+
+        text_left = rect.left() + ITEM_PADDING
+        if task.status != 'Completed':
+            # round checkbox indicator to mark the task as completed
+            checkbox = self.checkbox_rect(option)
+            painter.setPen(QPen(to_qcolor(CHECKBOX_BORDER_COLOR), 1))
+            painter.setBrush(to_qcolor(CHECKBOX_BG_COLOR))
+            painter.drawEllipse(checkbox)
+            text_left = checkbox.right() + ITEM_SPACING * 2
+
+        task_name = task.name
+        if len(task_name) > NAME_MAX_LENGTH:
+            task_name = task_name[:NAME_MAX_LENGTH] + '...'
+
+        text_rect = QRect(text_left, rect.top(), rect.right() - ITEM_PADDING - text_left, rect.height())
+        painter.setPen(item_text_color)
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, task_name)
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignRight, task.task_time_label)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index) -> bool:
+        if (
+            event.type() != QEvent.Type.MouseButtonRelease
+            or event.button() != Qt.MouseButton.LeftButton
+        ):
+            return False
+
+        task: Task = index.data(TaskRole)
+        if task is None or not self.item_rect(option).contains(event.position().toPoint()):
+            return False
+
+        # clicking the checkbox only completes the task, anywhere else opens it
+        if task.status != 'Completed' and self.checkbox_rect(option).contains(event.position().toPoint()):
+            self.complete_clicked.emit(task)
+        else:
+            self.task_clicked.emit(task)
+        return True
@@ -0,0 +1,110 @@
+"""
+Micro-benchmark of the hot listing path.
+
+Compares a per-call string-built query with inferred fetch mode against the
+prebuilt named statements with an explicit fetch mode, and the effect of
+sqlite3's statement cache. Run from the project root:
+
+    python -m benchmarks.bench_queries --tasks 10000 --repeat 2000
+"""
+import argparse
+import os
+import random
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+
+from Controllers import queries
+from Controllers.agenda_controller import AgendaController
+from Controllers.connection_profile import ConnectionProfile
+from Controllers.context_manager import ContextManager
+from Controllers.task_filter import TaskFilter
+from Models.task import Task
+
+DAY = '2024-06-01'
+
+
+def seed(agenda: AgendaController, count: int, seed_value: int = 42):
+    rng = random.Random(seed_value)
+    start = datetime(2024, 1, 1)
+    agenda.add_tasks(
+        Task(
+            f'Task {number}',
+            'Benchmark task',
+            start + timedelta(days=rng.randint(0, 365), minutes=rng.randint(0, 1439)),
+            rng.choice(Task.priorities()),
+            rng.choice(Task.statuses())
+        )
+        for number in range(count)
+    )
+
+
+def legacy_get_tasks(db: ContextManager, user_id: int, date: str, active_tasks: bool):
+    # string building and query parsing on every call, as get_tasks did before named statements
+    query = """
+        SELECT name, description, date, priority, status, id
+        FROM tasks
+        WHERE user_id = ?
+    """
+    if active_tasks:
+        query += "AND status in ('Pending', 'In Progress', 'On Hold')"
+
+    params = [user_id]
+    day = datetime.strptime(date, "%Y-%m-%d")
+    query += " AND date >= ? AND date < ?"
+    params.append(day.strftime("%Y-%m-%d"))
+    params.append((day + timedelta(days=1)).strftime("%Y-%m-%d"))
+    query += " ORDER BY priority_rank, date"
+
+    return db.execute(query, params)
+
+
+def named_get_tasks(db: ContextManager, user_id: int, date: str, active_tasks: bool):
+    # the query part of AgendaController.get_tasks, without building Task instances
+    statuses = TaskFilter.ACTIVE_STATUSES if active_tasks else None
+    conditions, params = TaskFilter.for_day(date, statuses=statuses).conditions()
+    statement = queries.filtered_statement('list', conditions)
+
+    return db.execute(statement.sql, (user_id, *params), statement.fetch_mode)
+
+
+def uncached_get_tasks(agenda: AgendaController, date: str, active_tasks: bool):
+    # listings are cached since AgendaCache, clear it so every call runs the query
+    agenda.cache.clear()
+    return agenda.get_tasks(date, active_tasks=active_tasks)
+
+
+def run(tasks: int, repeat: int) -> dict:
+    results = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, 'bench.db')
+        seed(AgendaController(1, ContextManager(ConnectionProfile(db_path))), tasks)
+
+        for cached_statements in (0, 256):
+            db = ContextManager(ConnectionProfile(db_path, cached_statements=cached_statements))
+            agenda = AgendaController(1, db)
+
+            cases = {
+                'legacy_query': lambda: legacy_get_tasks(db, 1, DAY, True),
+                'named_query': lambda: named_get_tasks(db, 1, DAY, True),
+                'get_tasks': lambda: uncached_get_tasks(agenda, DAY, True),
+                'get_tasks_cache_hit': lambda: agenda.get_tasks(DAY, active_tasks=True),
+            }
+            for name, case in cases.items():
+                seconds = min(timeit.repeat(case, number=repeat, repeat=3))
+                results[f'{name}[cached_statements={cached_statements}]'] = seconds / repeat * 1e6
+
+            db.close()
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    for case, microseconds in run(args.tasks, args.repeat).items():
+        print(f'{case:<45} {microseconds:10.1f} us/call')
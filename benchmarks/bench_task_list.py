@@ -0,0 +1,120 @@
+"""
+Benchmark of task list build time, headless.
+
+Compares the old per-row widget list (QWidget, layout, checkbox, labels and
+a stylesheet per task) with the TaskListModel/TaskItemDelegate view. Run
+from the project root:
+
+    python -m benchmarks.bench_task_list --tasks 1000 10000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6.QtWidgets import QApplication, QCheckBox, QHBoxLayout, QLabel, QListView, QScrollArea, QVBoxLayout, QWidget
+
+from Models.task import Task
+from Views.task_list import TaskItemDelegate, TaskListModel
+
+WIDTH, HEIGHT = 300, 400
+
+
+def make_tasks(count: int, seed_value: int = 42) -> list[Task]:
+    rng = random.Random(seed_value)
+    start = datetime(2024, 1, 1)
+    return [
+        Task(
+            f'Task {number}',
+            'Benchmark task',
+            start + timedelta(days=rng.randint(0, 365)),
+            rng.choice(Task.priorities()),
+            rng.choice(Task.statuses()),
+            identifier=number
+        )
+        for number in range(count)
+    ]
+
+
+def build_widget_list(tasks: list[Task]) -> QScrollArea:
+    # the previous create_task_list: one styled widget tree per task
+    scroll_area = QScrollArea()
+    content = QWidget()
+    layout = QVBoxLayout(content)
+
+    for task in tasks:
+        item_bg_color, item_text_color = task.priority_color
+        if task.status == 'Completed':
+            item_bg_color, _ = task.status_color
+
+        item_container = QWidget()
+        item_container.setObjectName("itemContainer")
+        item_container.setFixedHeight(50)
+        item_container.setStyleSheet(f"""
+            QWidget#itemContainer {{ background-color: {item_bg_color}; color: {item_text_color}; }}
+            QWidget#itemContainer:hover {{ background-color: rgba(255, 255, 255, 0.15); }}
+            QCheckBox::indicator {{ width: 20px; height: 20px; border-radius: 11px; border: 1px solid gray; }}
+        """)
+        item_layout = QHBoxLayout(item_container)
+        if task.status != 'Completed':
+            item_layout.addWidget(QCheckBox())
+
+        text = QLabel(task.name[:25])
+        text.setStyleSheet(f"color: {item_text_color};")
+        item_layout.addWidget(text)
+        item_layout.addStretch()
+
+        time_label = QLabel(task.task_time_label)
+        time_label.setStyleSheet(f"color: {item_text_color};")
+        item_layout.addWidget(time_label)
+        layout.addWidget(item_container)
+
+    scroll_area.setWidget(content)
+    scroll_area.setWidgetResizable(True)
+    return scroll_area
+
+
+def build_model_view(tasks: list[Task]) -> QListView:
+    view = QListView()
+    model = TaskListModel(view)
+    view.setModel(model)
+    view.setItemDelegate(TaskItemDelegate(view))
+    view.setUniformItemSizes(True)
+    model.set_tasks(tasks)
+    return view
+
+
+def measure(builder, tasks: list[Task]) -> float:
+    started = time.perf_counter()
+    widget = builder(tasks)
+    widget.resize(WIDTH, HEIGHT)
+    # render once so both variants pay for styling and painting
+    widget.grab()
+    elapsed = time.perf_counter() - started
+    widget.deleteLater()
+    QApplication.processEvents()
+    return elapsed
+
+
+def run(sizes: list[int]) -> dict:
+    app = QApplication.instance() or QApplication(sys.argv)
+    results = {}
+    for size in sizes:
+        tasks = make_tasks(size)
+        results[f'widget_list[{size}]'] = measure(build_widget_list, tasks) * 1000
+        results[f'model_view[{size}]'] = measure(build_model_view, tasks) * 1000
+    app.processEvents()
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, nargs='+', default=[1000, 10000])
+    args = parser.parse_args()
+
+    for case, milliseconds in run(args.tasks).items():
+        print(f'{case:<25} {milliseconds:10.1f} ms')
@@ -0,0 +1,188 @@
+"""
+Benchmark suite of the agenda hot paths, with JSON output for tracking regressions.
+
+Seeds a temporary database per size with Controllers.gen_tasks and times the
+listing, CRUD, Task construction and headless task list rendering paths.
+Run from the project root:
+
+    python -m benchmarks.suite --tasks 1000 100000 --users 10 --output results.json
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from Controllers.agenda_controller import AgendaController
+from Controllers.connection_profile import ConnectionProfile
+from Controllers.context_manager import ContextManager
+from Controllers.gen_tasks import generate_tasks, populate
+from Controllers.task_filter import TaskFilter
+from Models.task import Task
+
+DAY = '2024-06-01'
+
+
+def measure(function, rounds: int, number: int = 1, setup=None) -> dict:
+    """
+    Time number calls of function, rounds times.
+
+    :param setup: called before every round, not timed
+    :return: seconds per call of the fastest, median and mean round
+    """
+    timings = []
+    for _ in range(rounds):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - started) / number)
+
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.fmean(timings),
+        'rounds': rounds,
+        'number': number
+    }
+
+
+def controller_cases(agenda: AgendaController, rounds: int) -> dict:
+    results = {}
+    day_filter = TaskFilter.for_day(DAY, statuses=TaskFilter.ACTIVE_STATUSES)
+
+    # listings, cold runs the query and builds the tasks, warm is served by the cache
+    results['get_tasks.cold'] = measure(lambda: agenda.get_tasks(DAY, active_tasks=True), rounds, setup=agenda.cache.clear)
+    results['get_tasks.warm'] = measure(lambda: agenda.get_tasks(DAY, active_tasks=True), rounds, number=100)
+    results['get_tasks_page'] = measure(lambda: agenda.get_tasks_page(None, None, 100), rounds)
+    results['count_tasks'] = measure(lambda: agenda.count_tasks(day_filter), rounds)
+    results['search_tasks'] = measure(lambda: agenda.search_tasks('review', 50), rounds)
+    results['day_counts'] = measure(lambda: agenda.day_counts('2024-06-01', '2024-07-01'), rounds)
+
+    # CRUD, every call works on a task of its own
+    new_tasks = iter(generate_tasks(rounds * 10, seed=7))
+    created = []
+
+    def add_task():
+        _, task = next(new_tasks)
+        created.append(agenda.add_task(task.name, task.description, task.date, task.priority, task.status)['task'])
+
+    updates = iter(range(rounds * 10))
+
+    def update_task():
+        task = created[next(updates)]
+        agenda.update_task(task.id, task.name, 'Updated', task.date, task.priority, task.status)
+
+    results['add_task'] = measure(add_task, rounds, number=10)
+    results['update_task'] = measure(update_task, rounds, number=10)
+    results['get_task'] = measure(lambda: agenda.get_task(created[0].id), rounds, number=100)
+    results['set_as_completed'] = measure(lambda: agenda.set_as_completed(created[0].id), rounds, number=10)
+    results['delete_task'] = measure(lambda: agenda.delete_task(created.pop().id), rounds, number=10)
+
+    return results
+
+
+def task_construction_case(rounds: int, count: int = 10000) -> dict:
+    rows = [
+        (task.name, task.description, task.date, task.priority, task.status, number)
+        for number, (_, task) in enumerate(generate_tasks(count))
+    ]
+    results = measure(lambda: [Task(*row[:5], identifier=row[5]) for row in rows], rounds)
+    return {**results, 'tasks': count}
+
+
+def task_list_case(db_path: str, rounds: int) -> dict:
+    # the real window on the offscreen platform, listing loaded through the worker and painted once
+    os.environ['TASKMANAGER_DB_PATH'] = db_path
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    import main
+
+    window = main.MainWindow()
+    window.show_all.setChecked(True)
+    window.show_hidden_tasks.setChecked(True)
+
+    def render():
+        window.update_tasks_list()
+        window.loader.wait()
+        app.processEvents()
+        window.task_view.grab()
+
+    results = measure(render, rounds)
+    window.loader.wait()
+    window.hide()
+    window.deleteLater()
+    app.processEvents()
+    return results
+
+
+def run(sizes: list[int], users: int, seed: int, rounds: int, gui: bool = True) -> dict:
+    report = {
+        'meta': {
+            'created': datetime.now().isoformat(' ', 'seconds'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'users': users,
+            'seed': seed,
+            'unit': 'seconds per call'
+        },
+        'results': {}
+    }
+    results = report['results']
+    results['task_construction'] = task_construction_case(rounds)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            db_path = os.path.join(directory, f'bench-{size}.db')
+            db = ContextManager(ConnectionProfile(db_path))
+
+            started = time.perf_counter()
+            populate(db, size, users, seed)
+            results[f'populate[{size}]'] = {'seconds': time.perf_counter() - started, 'tasks': size}
+
+            for name, result in controller_cases(AgendaController(1, db), rounds).items():
+                results[f'{name}[{size}]'] = result
+            db.close()
+
+            if gui:
+                results[f'create_task_list[{size}]'] = task_list_case(db_path, rounds)
+                ContextManager.shared(ConnectionProfile(db_path)).close()
+
+    return report
+
+
+def print_report(report: dict):
+    for case, result in report['results'].items():
+        if 'min' in result:
+            print(f"{case:<40} {result['min'] * 1e6:12.1f} us min {result['median'] * 1e6:12.1f} us median")
+        else:
+            print(f"{case:<40} {result['seconds']:12.2f} s")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, nargs='+', default=[1000, 100000])
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--no-gui', action='store_true', help='skip the task list rendering case')
+    parser.add_argument('--output', help='write the JSON report to this file instead of stdout')
+    args = parser.parse_args()
+
+    report = run(args.tasks, args.users, args.seed, args.rounds, gui=not args.no_gui)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+        print_report(report)
+    else:
+        json.dump(report, sys.stdout, indent=2)
@@ -0,0 +1,251 @@
+"""
+Headless agenda command line, JSON lines on stdout, no Qt needed.
+
+    python cli.py list --date 2024-06-01 --status Pending "In Progress"
+    python cli.py list --search dentist
+    python cli.py add "Call the dentist" --date "2024-06-01 09:30" --priority High
+    python cli.py add "Standup" --date "2024-06-03 09:00" --rrule "FREQ=WEEKLY;BYDAY=MO,WE,FR"
+    python cli.py complete 12 13 14
+    python cli.py import tasks.jsonl --progress   (.csv, or - for JSON lines on stdin)
+    python cli.py export --output tasks.csv --status Pending
+    python cli.py add-user Jane Doe   (tasks belong to --user, 1 by default)
+
+Every command writes one JSON object per line and exits with 1 when any line failed.
+"""
+import argparse
+import json
+import sys
+import time
+from contextlib import nullcontext
+from datetime import datetime
+
+from Controllers import task_io
+from Controllers.agenda_controller import AgendaController
+from Controllers.connection_profile import ConnectionProfile
+from Controllers.context_manager import ContextManager
+from Controllers.task_filter import TaskFilter
+from Controllers.user_controller import UserController
+from Models.task import Task
+
+PAGE_SIZE = 1000
+
+
+def emit(record: dict):
+    sys.stdout.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def parse_day(value: str) -> datetime:
+    return datetime.strptime(value, '%Y-%m-%d')
+
+
+def parse_datetime(value: str) -> datetime:
+    # naive local time like the stored dates, see Task.from_dict
+    date = datetime.fromisoformat(value)
+    return date.astimezone().replace(tzinfo=None) if date.tzinfo is not None else date
+
+
+def build_filter(args) -> TaskFilter:
+    if args.date:
+        return TaskFilter.for_day(args.date, statuses=args.status, priorities=args.priority, text=args.text)
+    return TaskFilter(args.status, args.priority, args.start, args.end, args.text)
+
+
+def add_filter_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--date', type=parse_day, help='only this day, YYYY-MM-DD')
+    parser.add_argument('--start', type=parse_day, help='first day, YYYY-MM-DD')
+    parser.add_argument('--end', type=parse_day, help='day after the last one, YYYY-MM-DD')
+    parser.add_argument('--status', nargs='+', choices=Task.statuses())
+    parser.add_argument('--priority', nargs='+', choices=Task.priorities())
+    parser.add_argument('--text', help='words starting words of the name or description')
+
+
+def list_tasks(agenda: AgendaController, args) -> bool:
+    if args.search:
+        response = agenda.search_tasks(args.search, args.limit or 50)
+        if not response['success']:
+            emit(response)
+            return False
+
+        for task in response['tasks']:
+            emit(task.to_dict())
+        return True
+
+    task_filter = build_filter(args)
+
+    if task_filter.is_bounded():
+        # recurring tasks are expanded into their occurrences within the range
+        response = agenda.find_tasks(task_filter)
+        if not response['success']:
+            emit(response)
+            return False
+
+        for task in response['tasks'][:args.limit]:
+            emit(task.to_dict())
+        return True
+
+    # keyset pages, memory stays flat however many tasks match
+    remaining = args.limit
+    cursor = None
+    while remaining is None or remaining > 0:
+        page_size = PAGE_SIZE if remaining is None else min(PAGE_SIZE, remaining)
+        response = agenda.get_tasks_page(task_filter, cursor, page_size)
+        if not response['success']:
+            emit(response)
+            return False
+
+        for task in response['tasks']:
+            emit(task.to_dict())
+
+        if remaining is not None:
+            remaining -= len(response['tasks'])
+        if not response['has_more']:
+            break
+        cursor = response['cursor']
+
+    return True
+
+
+def add_task(agenda: AgendaController, args) -> bool:
+    date = args.date or datetime.now().replace(microsecond=0)
+    response = agenda.add_task(args.name, args.description, date, args.priority, args.status, args.rrule)
+
+    if response['success']:
+        emit({'success': True, 'task': response['task'].to_dict()})
+    else:
+        emit(response)
+    return response['success']
+
+
+def add_user(agenda: AgendaController, args) -> bool:
+    response = UserController(agenda.db).add_user(args.first_name, args.last_name)
+
+    if response['success']:
+        user = response['user']
+        emit({'success': True, 'user': {'id': user.id, 'first_name': user.first_name, 'last_name': user.last_name}})
+    else:
+        emit(response)
+    return response['success']
+
+
+def complete_tasks(agenda: AgendaController, args) -> bool:
+    response = agenda.complete_tasks(args.ids)
+    for result in response['results']:
+        emit(result)
+    return response['success']
+
+
+def import_tasks(agenda: AgendaController, args) -> bool:
+    # streamed chunk by chunk, failed records and a summary are written as JSON lines
+    file_format = args.format or task_io.guess_format(args.file)
+    # the standard streams are left open
+    source = nullcontext(sys.stdin) if args.file == '-' else open(args.file, encoding='utf-8', newline='')
+
+    with source as stream:
+        summary = task_io.import_tasks(
+            agenda, task_io.read_records(stream, file_format), args.batch_size,
+            progress=Progress('imported') if args.progress else None,
+            on_error=emit
+        )
+
+    emit(summary)
+    return summary['success']
+
+
+def export_tasks(agenda: AgendaController, args) -> bool:
+    file_format = args.format or task_io.guess_format(args.output or '-')
+    if args.output in (None, '-'):
+        target = nullcontext(sys.stdout)
+    else:
+        target = open(args.output, 'w', encoding='utf-8', newline='')
+
+    with target as stream:
+        task_io.export_tasks(
+            task_io.iter_tasks(agenda, build_filter(args)), stream, file_format,
+            progress=Progress('exported') if args.progress else None
+        )
+    return True
+
+
+class Progress:
+    # running totals on stderr, stdout stays machine readable
+    def __init__(self, action: str):
+        self.action = action
+        self.started = time.perf_counter()
+
+    def __call__(self, done: int, failed: int = 0):
+        elapsed = time.perf_counter() - self.started
+        rate = done / elapsed if elapsed else 0
+        failures = f", {failed} failed" if failed else ""
+        print(f"{done} {self.action}{failures}, {rate:.0f} tasks/s", file=sys.stderr)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', help='database file, TASKMANAGER_DB_PATH or the app database by default')
+    parser.add_argument('--user', type=int, default=1)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = commands.add_parser('list', help='stream tasks ordered by priority and date')
+    add_filter_arguments(list_parser)
+    list_parser.add_argument('--search', help='full-text search, best matches first')
+    list_parser.add_argument('--limit', type=int)
+    list_parser.set_defaults(run=list_tasks)
+
+    add_parser = commands.add_parser('add', help='add one task')
+    add_parser.add_argument('name')
+    add_parser.add_argument('--description', default='')
+    add_parser.add_argument('--date', type=parse_datetime, help='YYYY-MM-DD HH:MM, now by default')
+    add_parser.add_argument('--priority', choices=Task.priorities(), default='Low')
+    add_parser.add_argument('--status', choices=Task.statuses(), default='Pending')
+    add_parser.add_argument('--rrule', help='repeat by an iCalendar RRULE, e.g. FREQ=WEEKLY;BYDAY=MO')
+    add_parser.set_defaults(run=add_task)
+
+    user_parser = commands.add_parser('add-user', help='add a user, tasks of other users are not visible to it')
+    user_parser.add_argument('first_name')
+    user_parser.add_argument('last_name')
+    user_parser.set_defaults(run=add_user, needs_user=False)
+
+    complete_parser = commands.add_parser('complete', help='mark tasks as completed')
+    complete_parser.add_argument('ids', type=int, nargs='+')
+    complete_parser.set_defaults(run=complete_tasks)
+
+    import_parser = commands.add_parser('import', help='add tasks from JSON lines or CSV, streamed')
+    import_parser.add_argument('file', nargs='?', default='-')
+    import_parser.add_argument('--format', choices=task_io.FORMATS, help='by file extension, jsonl by default')
+    import_parser.add_argument('--batch-size', type=int, default=task_io.CHUNK_SIZE, help='tasks per transaction')
+    import_parser.add_argument('--progress', action='store_true', help='report progress on stderr')
+    import_parser.set_defaults(run=import_tasks)
+
+    export_parser = commands.add_parser('export', help='write tasks as JSON lines or CSV, streamed')
+    add_filter_arguments(export_parser)
+    export_parser.add_argument('--output', '-o', help='file to write, stdout by default')
+    export_parser.add_argument('--format', choices=task_io.FORMATS, help='by file extension, jsonl by default')
+    export_parser.add_argument('--progress', action='store_true', help='report progress on stderr')
+    export_parser.set_defaults(run=export_tasks)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    profile = ConnectionProfile.from_env()
+    if args.db:
+        profile.db_path = args.db
+
+    db = ContextManager.shared(profile)
+    if getattr(args, 'needs_user', True) and not UserController(db).get_user(args.user)['success']:
+        # tasks reference their user, an unknown id would only fail on the first write
+        emit({'success': False, 'message': f'User with id:{args.user} was not found, create one with add-user'})
+        return 1
+
+    agenda = AgendaController(args.user, db)
+    try:
+        return 0 if args.run(agenda, args) else 1
+    except BrokenPipeError:
+        # output piped into head and the like
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,19 +1,40 @@
+import time
+
+# reference point of --profile-startup, taken before the Qt imports
+STARTED = time.perf_counter()
+
 import os
 import sys
 
 from functools import partial
-from PySide6.QtCore import Qt
-from PySide6.QtCore import QDateTime
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import QDateTime, QTimer
 from PySide6.QtGui import QIcon, QAction
 from PySide6.QtWidgets import (QPushButton, QWidget, QVBoxLayout,
-                               QScrollArea, QLabel, QMainWindow,
+                               QListView, QLabel, QMainWindow,
                                QApplication, QHBoxLayout, QDateTimeEdit,
                                QComboBox, QTextEdit, QLineEdit, QCheckBox, QSystemTrayIcon, QMenu)
 
 from Controllers.agenda_controller import AgendaController
+from Controllers.task_filter import TaskFilter
 from Models.task import Task
+from Views.agenda_loader import AgendaLoader
+from Views.calendar_badges import CalendarBadges, visible_range
+from Views.style import APP_STYLESHEET
+from Views.task_list import TaskListModel, TaskItemDelegate
 
 WIDTH, HEIGHT = 300, 400
+PAGE_SIZE = 100
+SEARCH_LIMIT = 50
+# choices of the Repeat input, as RRULE text
+REPEAT_RULES = {
+    'Does not repeat': None,
+    'Daily': 'FREQ=DAILY',
+    'Weekdays': 'FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR',
+    'Weekly': 'FREQ=WEEKLY',
+    'Monthly': 'FREQ=MONTHLY',
+    'Yearly': 'FREQ=YEARLY',
+}
 MAIN_BG_COLOR = '#1f1f1f'
 SECOND_BG_COLOR = '#2a2a2a'
 FALSE_BG_COLOR = 'rgba(77, 46, 46, 0.8)'
@@ -23,11 +44,18 @@ TRUE_TEXT_COLOR = 'lightgreen'
 
 
 class MainWindow(QMainWindow):
-    scroll_area: QScrollArea
+    # a listing reached the task list, the first one ends the startup
+    tasks_loaded = Signal()
+
+    task_view: QListView
+    task_model: TaskListModel
+    task_delegate: TaskItemDelegate
     calendar: None | QDateTimeEdit
     show_hidden_tasks: QCheckBox
     show_all: QCheckBox
+    search_input: QLineEdit
     count_label: QLabel
+    no_items_label: QLabel
 
     extended_widget: QWidget
     extended_layout: QVBoxLayout
@@ -37,12 +65,17 @@ class MainWindow(QMainWindow):
     description_input: QTextEdit
     name_input: QLineEdit
     datetime_input: QDateTimeEdit
+    repeat_combo: QComboBox
 
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Todo's Manager")
         self.setWindowIcon(QIcon(self.resource_path('assets/icon-w.png')))
         self.agenda = AgendaController(1)
+        # every agenda call runs off the GUI thread
+        self.loader = AgendaLoader(self)
+        # set up by finish_startup
+        self.reminders = None
 
         self.date = QDateTime.currentDateTime()
         self.tasks = []
@@ -78,14 +111,30 @@ class MainWindow(QMainWindow):
         # Set the parent layout widget as the central widget
         self.setCentralWidget(self.parent_layout_widget)
 
-        # Initialize the system tray
-        self.init_system_tray()
-
         # Make the window stay on top
         self.setWindowFlag(Qt.WindowStaysOnTopHint)
 
-        # show widget
+        # show the empty shell at once, everything else runs once the event loop is up
         self.show()
+        QTimer.singleShot(0, self.finish_startup)
+
+    def finish_startup(self):
+        # first agenda page first, it is queued on the worker while the rest is built
+        self.update_tasks_list()
+
+        # Initialize the system tray
+        self.init_system_tray()
+
+        # tray notifications when open tasks are due
+        from Views.reminder_scheduler import ReminderScheduler
+
+        self.reminders = ReminderScheduler(self.agenda, self.loader, self.show_reminder, parent=self)
+        self.reminders.reload()
+
+        # per-day task load on the calendar popup, reloaded for every month shown
+        self.calendar_badges = CalendarBadges(self.calendar.calendarWidget())
+        self.calendar.calendarWidget().currentPageChanged.connect(self.refresh_day_counts)
+        self.refresh_day_counts()
 
     @staticmethod
     def resource_path(relative_path):
@@ -120,6 +169,19 @@ class MainWindow(QMainWindow):
 
         # Handle double-click to show the window
         self.tray_icon.activated.connect(self.on_tray_icon_activated)
+        self.tray_icon.messageClicked.connect(self.show)
+
+    def show_reminder(self, task: Task):
+        icon = QSystemTrayIcon.MessageIcon.Information
+        if task.priority in ('High', 'Critical'):
+            icon = QSystemTrayIcon.MessageIcon.Warning
+
+        self.tray_icon.showMessage(
+            task.name,
+            f"{task.priority} priority, due {task.get_datetime().strftime('%H:%M')}",
+            icon,
+            10000
+        )
 
     def on_tray_icon_activated(self, reason):
         if reason == QSystemTrayIcon.ActivationReason.Trigger:
@@ -140,6 +202,8 @@ class MainWindow(QMainWindow):
         self.calendar.setDisplayFormat("dd-MM-yyyy")
         self.calendar.setCalendarPopup(True)
         self.calendar.dateChanged.connect(self.change_date)
+        # set up by finish_startup
+        self.calendar_badges = None
 
         self.show_hidden_tasks = QCheckBox('Show all')
         self.show_hidden_tasks.clicked.connect(self.update_tasks_list)
@@ -173,8 +237,18 @@ class MainWindow(QMainWindow):
         # add our created header layout to main layout
         self.main_layout.addLayout(layout)
 
+        # search box, queries once typing pauses for a moment
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText('Search tasks')
+        self.search_input.setClearButtonEnabled(True)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.update_tasks_list)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        self.main_layout.addWidget(self.search_input)
+
     def open_task_info(self, _, task: Task):
-        item_bg_color, item_text_color = task.status_color
         widget, layout = self.create_extended_tab(600)
 
         # Construct head of info widget
@@ -184,30 +258,15 @@ class MainWindow(QMainWindow):
 
         # create task head layout with status and close button
         task_status = QLabel(f'Task is {task.status}')
-        task_status.setStyleSheet(f"""
-            background-color: {item_bg_color};
-            color: {item_text_color};
-            text-transform: uppercase;
-            font-weight: bold;
-            padding: 10px;
-            border: solid 1px {item_text_color};
-            border-radius: 5px;
-        """)
+        task_status.setProperty('badge', 'status')
+        task_status.setProperty('status', task.status)
 
         head_layout.addWidget(task_status)
 
-        # add priority to head
-        item_bg_color, item_text_color = task.priority_color
+        # add priority to head, colored by the application stylesheet
         task_priority = QLabel(f'{task.priority} Priority')
-        task_priority.setStyleSheet(f"""
-            background-color: {item_bg_color};
-            color: {item_text_color};
-            text-transform: uppercase;
-            font-weight: bold;
-            padding: 10px;
-            border: solid 1px {item_text_color};
-            border-radius: 5px;
-        """)
+        task_priority.setProperty('badge', 'priority')
+        task_priority.setProperty('priority', task.priority)
         head_layout.addWidget(task_priority)
 
         # stretch head for close button
@@ -274,172 +333,136 @@ class MainWindow(QMainWindow):
         print(task)
 
     def mark_complete(self, _, task: Task):
-        update = self.agenda.set_as_completed(task.id)
+        if task.occurrence is not None:
+            # only this occurrence, the rest of the series stays open
+            self.loader.submit(
+                None, self.agenda.complete_occurrence, task.id, task.occurrence,
+                callback=self.on_occurrences_changed
+            )
+            return
+
+        self.loader.submit(
+            None, self.agenda.set_as_completed, task.id,
+            callback=partial(self.on_marked_complete, task=task)
+        )
+
+    def on_marked_complete(self, update: dict, task: Task):
         if update['success']:
             print(f"Task marked as complete: {task.id}")
-            self.update_tasks_list()
+            self.apply_task_change(task.id, self.completed_copy(task))
         else:
             print(f"{update['message']}")
 
     def create_task_list(self):
-        try:
-            if (
-                    hasattr(self, 'count_label')
-                    and self.count_label
-                    and self.count_label.isWidgetType()
-            ):
-                self.count_label.deleteLater()
-        except RuntimeError:
-            pass
-
-        # Create scrollable area
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setObjectName('task_list')
+        # counter of found tasks, hidden when the list is empty
+        self.count_label = QLabel()
+        self.main_layout.addWidget(self.count_label)
+
+        self.no_items_label = QLabel('No items found')
+        self.no_items_label.setStyleSheet("""
+            color: crimson;
+            padding: 20px;
+        """)
+        self.main_layout.addWidget(self.no_items_label)
+
+        # model holds the tasks, delegate paints only the visible rows
+        self.task_model = TaskListModel(self)
+        self.task_model.fetch_more_requested.connect(self.fetch_more_tasks)
+        self.task_count = 0
+        self.task_delegate = TaskItemDelegate(self)
+        self.task_delegate.task_clicked.connect(
+            lambda task: self.open_task_info(None, task=task)
+        )
+        self.task_delegate.complete_clicked.connect(
+            lambda task: self.mark_complete(None, task=task)
+        )
 
-        # Create container where content will be placed
-        scrollable_content = QWidget()
-        scrollable_content.setObjectName('scroll_content')
-        scrollable_content.setStyleSheet(f"""
-            QWidget#scroll_content {{
+        self.task_view = QListView()
+        self.task_view.setObjectName('task_list')
+        self.task_view.setModel(self.task_model)
+        self.task_view.setItemDelegate(self.task_delegate)
+        self.task_view.setUniformItemSizes(True)
+        self.task_view.setMouseTracking(True)
+        self.task_view.setSelectionMode(QListView.SelectionMode.ExtendedSelection)
+        self.task_view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.task_view.customContextMenuRequested.connect(self.open_task_list_menu)
+        self.task_view.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.task_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.task_view.setStyleSheet(f"""
+            QListView#task_list {{
                 background: {MAIN_BG_COLOR};
             }}
         """)
-        scrollable_content.setContentsMargins(0, 0, 0, 0)  # Set margins
 
-        # Set layout to our container
-        layout = QVBoxLayout(scrollable_content)
-        layout.setContentsMargins(0, 0, 0, 0)  # Set margins
-        layout.setSpacing(5)  # Optional: Add spacing between items
+        # Add our list view to main content
+        self.main_layout.addWidget(self.task_view)
 
-        if self.show_all.isChecked():
-            get_tasks_response = self.agenda.get_tasks()
-        else:
-            active_tasks = not self.show_hidden_tasks.isChecked()
-            get_tasks_response = self.agenda.get_tasks(
-                self.date.toString('yyyy-MM-dd'),
-                active_tasks=active_tasks
-            )
+    def selected_tasks(self) -> list[Task]:
+        return [
+            self.task_model.task(index.row())
+            for index in self.task_view.selectionModel().selectedRows()
+        ]
 
-        if get_tasks_response['success']:
-            self.tasks = get_tasks_response['tasks']
-        else:
-            self.tasks = []
+    def open_task_list_menu(self, position):
+        tasks = self.selected_tasks()
+        if not tasks:
+            return
 
-        if len(self.tasks) == 0:
-            no_items_label = QLabel('No items found')
-            no_items_label.setStyleSheet("""
-                color: crimson;
-                padding: 20px;
-            """)
-            layout.addWidget(no_items_label)
-        else:
-            self.count_label = QLabel(f'Tasks: {len(self.tasks)}')
-            self.main_layout.addWidget(self.count_label)
-
-            # Add items to the scrollable container layout
-            for num, task in enumerate(self.tasks):
-                if (
-                    not self.show_hidden_tasks.isChecked()
-                    and task.status in ('Cancelled', 'Completed')
-                ):
-                    continue
-
-                # Create item container
-                item_container = QWidget()
-
-                # Set a unique object name
-                item_container.setObjectName("itemContainer")
-                item_container.setContentsMargins(15, 0, 15, 0)
-                item_container.setFixedHeight(50)
-
-                # get task colors
-                item_bg_color, item_text_color = task.priority_color
-                if task.status == 'Completed':
-                    item_bg_color, _ = task.status_color
-
-                item_container.setStyleSheet(f"""
-                    QWidget#itemContainer {{
-                        background-color: {item_bg_color};
-                        color: {item_text_color};
-                    }}
-
-                    QWidget#itemContainer:hover {{
-                        background-color: rgba(255, 255, 255, 0.15);
-                    }}
-
-                    QCheckBox#itemContainer {{
-                        padding-right: 115px;
-                    }}
-
-                    QCheckBox::indicator {{
-                        width: 20px;
-                        height: 20px;
-                        border-radius: 11px;
-                        border: 1px solid gray;
-                        background-color: rgba(255, 255, 255, 0.1);
-                    }}
-
-                    QCheckBox::indicator:unchecked {{
-                        background-color: rgba(255, 255, 255, 0.1);
-                    }}
-
-                    QCheckBox::indicator:hover {{
-                        background-color: rgba(46, 77, 46, 0.8);
-                    }}
-                """)
-
-                # Set container layout
-                item_layout = QHBoxLayout(item_container)
-                item_layout.setContentsMargins(0, 0, 0, 0)
-
-                if task.status != 'Completed':
-                    # Add our item info to layout
-                    checkbox = QCheckBox()
-                    item_layout.addWidget(checkbox)
-                    checkbox.mouseReleaseEvent = partial(
-                        self.mark_complete, task=task
-                    )
-
-                task_name = task.name
-                if len(task.name) > 25:
-                    task_name = task.name[:25] + '...'
-
-                text = QLabel(f'{task_name}')
-                text.setStyleSheet(f"color: {item_text_color};")
-                item_layout.addWidget(text)
-
-                # Add stretch to push items to fill space
-                item_layout.addStretch()
-
-                time_label = QLabel(task.task_time_label)
-                time_label.setObjectName('task_time_label')
-                time_label.setStyleSheet(f"""
-                    QLabel#task_time_label {{
-                        color: {item_text_color};
-                    }}
-                """)
-
-                item_layout.addWidget(time_label)
-
-                # Add the item container to the scrollable layout
-                layout.addWidget(item_container)
-
-                # Add event listeners
-                item_container.mouseReleaseEvent = partial(
-                    self.open_task_info, task=task
-                )
+        # actions for all selected tasks at once
+        menu = QMenu(self)
+        complete_action = menu.addAction(f'Complete selected ({len(tasks)})')
+        complete_action.triggered.connect(partial(self.complete_tasks, tasks=tasks))
+        delete_action = menu.addAction(f'Delete selected ({len(tasks)})')
+        delete_action.triggered.connect(partial(self.delete_tasks, tasks=tasks))
+        menu.exec(self.task_view.viewport().mapToGlobal(position))
+
+    def complete_tasks(self, _, tasks: list[Task]):
+        tasks = [task for task in tasks if task.status != 'Completed']
+        occurrences = [(task.id, task.occurrence) for task in tasks if task.occurrence is not None]
+        if occurrences:
+            self.loader.submit(
+                None, self.agenda.complete_occurrences, occurrences,
+                callback=self.on_occurrences_changed
+            )
 
-        # dont set spaces between items
-        layout.addStretch()
+        self.loader.submit(
+            None, self.agenda.complete_tasks,
+            [task.id for task in tasks if task.occurrence is None],
+            callback=partial(self.on_tasks_completed, tasks=tasks)
+        )
 
-        # Add our created content to the scrollable area
-        self.scroll_area.setWidget(scrollable_content)
+    def on_tasks_completed(self, action_response: dict, tasks: list[Task]):
+        completed = {task.id: task for task in tasks}
+        for result in action_response['results']:
+            if result['success']:
+                self.apply_task_change(result['id'], self.completed_copy(completed[result['id']]))
+            else:
+                print(result['message'])
+
+    def on_occurrences_changed(self, action_response: dict):
+        for result in action_response.get('results', [action_response]):
+            if not result['success']:
+                print(result['message'])
+
+        # occurrences share their series' id, the listing is loaded again
+        self.refresh_day_counts()
+        self.update_tasks_list()
+        if self.reminders is not None:
+            self.reminders.reload()
 
-        # Ensure the widget resizes with the scroll area
-        self.scroll_area.setWidgetResizable(True)
+    def delete_tasks(self, _, tasks: list[Task]):
+        self.loader.submit(
+            None, self.agenda.delete_tasks, [task.id for task in tasks],
+            callback=self.on_tasks_deleted
+        )
+        self.close_extended_tab()
 
-        # Add our scroll area to main content
-        self.main_layout.addWidget(self.scroll_area)
+    def on_tasks_deleted(self, action_response: dict):
+        for result in action_response['results']:
+            if result['success']:
+                self.apply_task_change(result['id'])
+            else:
+                print(result['message'])
 
     def open_create_task_window(self, _, task: Task = None):
         heading = 'Create Task'
@@ -527,6 +550,12 @@ class MainWindow(QMainWindow):
             )
         create_form_layout.addWidget(self.datetime_input)
 
+        # Repeat input, a new task only, an occurrence is edited on its own
+        self.repeat_combo = QComboBox()
+        self.repeat_combo.addItems(REPEAT_RULES.keys())
+        if not task:
+            create_form_layout.addWidget(self.repeat_combo)
+
         # Submit button
         submit_button = QPushButton("Submit")
         submit_button.setStyleSheet(f"""
@@ -551,9 +580,105 @@ class MainWindow(QMainWindow):
             }}
         """)
 
+    def current_filter(self) -> TaskFilter:
+        # the tasks the list shows with the current date and checkboxes
+        statuses = None if self.show_hidden_tasks.isChecked() else TaskFilter.ACTIVE_STATUSES
+        if self.show_all.isChecked():
+            return TaskFilter(statuses=statuses)
+        return TaskFilter.for_day(self.date.toString('yyyy-MM-dd'), statuses=statuses)
+
     def update_tasks_list(self):
-        self.scroll_area.deleteLater()
-        self.create_task_list()
+        # a newer listing request drops the results of older ones still in flight
+        self.loader.cancel('tasks_page')
+
+        search_text = self.search_input.text().strip()
+        if search_text:
+            # ranked matches over every date replace the date listing while searching
+            self.loader.cancel('count')
+            self.loader.submit(
+                'tasks', self.agenda.search_tasks, search_text, SEARCH_LIMIT,
+                callback=self.show_search_results
+            )
+            return
+
+        task_filter = self.current_filter()
+        self.refresh_count(task_filter)
+
+        if self.show_all.isChecked():
+            # every date, loaded page by page as the list is scrolled
+            self.loader.submit(
+                'tasks', self.agenda.get_tasks_page, task_filter, None, PAGE_SIZE,
+                callback=self.show_tasks_page
+            )
+        else:
+            self.loader.submit(
+                'tasks', self.agenda.find_tasks, task_filter,
+                callback=self.show_tasks
+            )
+
+    def show_tasks(self, get_tasks_response: dict):
+        if get_tasks_response['success']:
+            self.tasks = get_tasks_response['tasks']
+        else:
+            self.tasks = []
+
+        # reuse the same view, only the model data is swapped
+        self.task_model.set_tasks(self.tasks)
+        self.tasks_loaded.emit()
+
+    def show_search_results(self, search_response: dict):
+        if not search_response['success']:
+            print(search_response['message'])
+        self.show_tasks(search_response)
+        self.task_count = len(self.tasks)
+        self.update_count_label()
+
+    def show_tasks_page(self, page_response: dict):
+        if page_response['success']:
+            self.task_model.set_tasks(page_response['tasks'], page_response['cursor'], page_response['has_more'])
+        else:
+            print(page_response['message'])
+            self.task_model.set_tasks([])
+        self.tasks_loaded.emit()
+
+    def fetch_more_tasks(self, cursor: tuple):
+        self.loader.submit(
+            'tasks_page', self.agenda.get_tasks_page, self.current_filter(), cursor, PAGE_SIZE,
+            callback=self.append_tasks_page
+        )
+
+    def append_tasks_page(self, page_response: dict):
+        if page_response['success']:
+            self.task_model.append_tasks(page_response['tasks'], page_response['cursor'], page_response['has_more'])
+        else:
+            print(page_response['message'])
+            self.task_model.append_tasks([], None, False)
+
+    def refresh_count(self, task_filter: TaskFilter | None = None):
+        # exact count from the database, paged lists hold only part of the tasks
+        self.loader.submit(
+            'count', self.agenda.count_tasks, task_filter or self.current_filter(),
+            callback=self.show_count
+        )
+
+    def show_count(self, count: int | bool):
+        self.task_count = count or 0
+        self.update_count_label()
+
+    def refresh_day_counts(self, *_):
+        # one summary table query for the whole grid of the shown month
+        if self.calendar_badges is None:
+            return
+
+        calendar = self.calendar.calendarWidget()
+        start, end = visible_range(calendar.yearShown(), calendar.monthShown())
+        self.loader.submit('day_counts', self.agenda.day_counts, start, end, callback=self.show_day_counts)
+
+    def show_day_counts(self, day_counts_response: dict):
+        if day_counts_response['success']:
+            self.calendar_badges.apply(day_counts_response['days'])
+        else:
+            print(day_counts_response['message'])
 
     def change_date(self, new_date):
         # Handle the selected date
@@ -611,18 +736,37 @@ class MainWindow(QMainWindow):
                 selected_priority == '' or date == ''):
             return
 
-        if task:
-            action_response = self.agenda.update_task(
+        if task and task.occurrence is not None:
+            # overrides this occurrence only
+            self.loader.submit(
+                None, self.agenda.update_occurrence,
+                task.id, task.occurrence, name, description,
+                date, selected_priority, selected_status,
+                callback=self.on_occurrence_submitted
+            )
+        elif task:
+            self.loader.submit(
+                None, self.agenda.update_task,
                 task.id, name, description,
-                date, selected_priority, selected_status
+                date, selected_priority, selected_status,
+                callback=self.on_task_submitted
             )
         else:
             # create task
-            action_response = self.agenda.add_task(
+            self.loader.submit(
+                None, self.agenda.add_task,
                 name, description, date,
-                selected_priority, selected_status
+                selected_priority, selected_status,
+                REPEAT_RULES[self.repeat_combo.currentText()],
+                callback=self.on_task_submitted
             )
 
+    def on_occurrence_submitted(self, action_response: dict):
+        if action_response['success']:
+            self.close_extended_tab()
+        self.on_occurrences_changed(action_response)
+
+    def on_task_submitted(self, action_response: dict):
         if not action_response['success']:
             print(action_response['message'])
             return
@@ -634,24 +778,88 @@ class MainWindow(QMainWindow):
             print(f"Task created! id: {task.id}")
 
         self.close_extended_tab()
-        self.update_tasks_list()
+        self.apply_task_change(task.id, task)
 
     def delete_task(self, _, task_id: int):
-        action_response = self.agenda.delete_task(task_id)
+        self.loader.submit(
+            None, self.agenda.delete_task, task_id,
+            callback=partial(self.on_task_deleted, task_id=task_id)
+        )
+        self.close_extended_tab()
+
+    def on_task_deleted(self, action_response: dict, task_id: int):
         if action_response['success']:
             print(f'Task deleted! id: {task_id}')
+            self.apply_task_change(task_id)
         else:
             print(action_response['message'])
 
-        self.close_extended_tab()
-        self.update_tasks_list()
+    def is_task_listed(self, task: Task) -> bool:
+        # whether task belongs in the list with the current date and checkboxes
+        return self.current_filter().matches(task)
+
+    def apply_task_change(self, task_id: int, task: Task | None = None):
+        # calendar badges and reminders follow every change
+        self.refresh_day_counts()
+        if self.reminders is not None:
+            self.reminders.task_changed(task_id, task)
+
+        # search results are ranked by the database, run the search again instead,
+        # a series is listed as any number of occurrence rows sharing its id
+        row = self.task_model.row_of(task_id)
+        listed = self.task_model.task(row) if row is not None else None
+        if self.search_input.text().strip() or any(changed is not None and changed.rrule for changed in (task, listed)):
+            self.update_tasks_list()
+            return
+
+        # apply one mutation as a row update, insert or removal instead of reloading the list
+        if task is not None and self.is_task_listed(task):
+            if not self.task_model.replace_task(task):
+                self.task_model.insert_task(task)
+        else:
+            self.task_model.remove_task(task_id)
+
+        self.refresh_count()
+
+    def update_count_label(self):
+        count = self.task_count
+        self.count_label.setText(f'Tasks: {count}')
+        self.count_label.setVisible(count > 0)
+        self.no_items_label.setVisible(count == 0)
+
+    @staticmethod
+    def completed_copy(task: Task) -> Task:
+        return Task(
+            task.name, task.description, task.date, task.priority, 'Completed',
+            identifier=task.id, rrule=task.rrule, occurrence=task.occurrence
+        )
 
 
 if __name__ == '__main__':
+    # --profile-startup prints the time to each startup stage and quits once the first page is shown
+    profile_startup = '--profile-startup' in sys.argv
+    if profile_startup:
+        sys.argv.remove('--profile-startup')
+
     app = QApplication(sys.argv)
+    app.setStyleSheet(APP_STYLESHEET)
+
+    profiler = None
+    if profile_startup:
+        from Views.startup_profiler import StartupProfiler
+
+        profiler = StartupProfiler(STARTED)
+        profiler.mark('imports')
 
     window = MainWindow()
     window.setFixedSize(WIDTH, HEIGHT)
     window.move(0, 0)
 
+    if profiler is not None:
+        profiler.mark('window built')
+        profiler.watch(window, window.main_widget)
+
+    # let pending writes finish before the process exits
+    app.aboutToQuit.connect(window.loader.wait)
+
     sys.exit(app.exec())
@@ -0,0 +1,32 @@
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+# the packages live at the repository root, next to main.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Controllers.agenda_cache import AgendaCache
+from Controllers.agenda_controller import AgendaController
+from Controllers.connection_profile import ConnectionProfile
+from Controllers.context_manager import ContextManager
+from Models.task import Task
+
+
+@pytest.fixture
+def db(tmp_path) -> ContextManager:
+    # a fresh database file per test, migrated to the latest schema
+    db = ContextManager(ConnectionProfile(str(tmp_path / 'tasks.db')))
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def agenda(db) -> AgendaController:
+    # user 1 is created by the migrations
+    return AgendaController(1, db, AgendaCache())
+
+
+def make_task(name: str, date: str = '2024-06-01 09:00', priority: str = 'Low', status: str = 'Pending') -> Task:
+    return Task(name, '', datetime.fromisoformat(date), priority, status)
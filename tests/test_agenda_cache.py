@@ -0,0 +1,81 @@
+from datetime import datetime
+
+import pytest
+
+from conftest import make_task
+from Controllers.task_filter import TaskFilter
+from Models.task import Task
+
+JUNE_1 = TaskFilter.for_day('2024-06-01')
+JUNE_2 = TaskFilter.for_day('2024-06-02')
+
+
+def names(agenda, task_filter: TaskFilter) -> list[str]:
+    response = agenda.find_tasks(task_filter)
+    return [task.name for task in response['tasks']] if response['success'] else []
+
+
+def test_repeated_listing_is_served_from_the_cache(agenda):
+    agenda.add_task('one', '', datetime(2024, 6, 1, 9))
+    names(agenda, JUNE_1)
+    names(agenda, TaskFilter.for_day('2024-06-01'))
+
+    assert agenda.cache.stats()['hits'] == 1
+
+
+def test_add_invalidates_only_the_day_of_the_task(agenda):
+    agenda.add_task('one', '', datetime(2024, 6, 1, 9))
+    agenda.add_task('two', '', datetime(2024, 6, 2, 9))
+    names(agenda, JUNE_1)
+    names(agenda, JUNE_2)
+
+    agenda.add_task('three', '', datetime(2024, 6, 1, 10))
+
+    assert names(agenda, JUNE_1) == ['one', 'three']
+    hits = agenda.cache.stats()['hits']
+    assert names(agenda, JUNE_2) == ['two']
+    assert agenda.cache.stats()['hits'] == hits + 1
+
+
+def test_update_moving_a_task_invalidates_both_days(agenda):
+    task = agenda.add_task('one', '', datetime(2024, 6, 1, 9))['task']
+    agenda.add_task('two', '', datetime(2024, 6, 2, 9))
+    names(agenda, JUNE_1)
+    names(agenda, JUNE_2)
+
+    agenda.update_task(task.id, 'one', '', datetime(2024, 6, 2, 8), 'Low', 'Pending')
+
+    assert names(agenda, JUNE_1) == []
+    assert names(agenda, JUNE_2) == ['one', 'two']
+
+
+@pytest.mark.parametrize('change', [
+    lambda agenda, task: agenda.delete_task(task.id),
+    lambda agenda, task: agenda.delete_tasks([task.id]),
+    lambda agenda, task: agenda.set_as_completed(task.id),
+    lambda agenda, task: agenda.complete_tasks([task.id]),
+])
+def test_deletes_and_completions_invalidate_active_listings(agenda, change):
+    task = agenda.add_task('one', '', datetime(2024, 6, 1, 9))['task']
+    active = TaskFilter.for_day('2024-06-01', statuses=TaskFilter.ACTIVE_STATUSES)
+    assert names(agenda, active) == ['one']
+
+    change(agenda, task)
+
+    assert names(agenda, active) == []
+
+
+def test_bulk_insert_and_update_invalidate(agenda):
+    names(agenda, JUNE_1)
+    agenda.insert_tasks([make_task('imported')])
+    assert names(agenda, JUNE_1) == ['imported']
+
+    task = agenda.find_tasks(JUNE_1)['tasks'][0]
+    agenda.update_tasks([Task('renamed', '', task.date, task.priority, task.status, identifier=task.id)])
+    assert names(agenda, JUNE_1) == ['renamed']
+
+
+def test_filters_used_as_cache_keys_are_immutable():
+    with pytest.raises(AttributeError):
+        JUNE_1.start = datetime(2024, 6, 2)
+    assert JUNE_1 == TaskFilter.for_day('2024-06-01')
@@ -0,0 +1,67 @@
+from conftest import make_task
+from Controllers.task_filter import TaskFilter
+from Models.task import Task
+
+
+def stored_names(agenda) -> list[str]:
+    return [row[0] for row in agenda.db.execute('SELECT name FROM tasks ORDER BY id', (), 'all')]
+
+
+def test_update_tasks_fails_a_bad_task_alone(agenda):
+    first = agenda.add_task('first', '', make_task('x').date)['task']
+    second = agenda.add_task('second', '', make_task('x').date)['task']
+    day = TaskFilter.for_day('2024-06-01')
+    assert len(agenda.find_tasks(day)['tasks']) == 2
+
+    response = agenda.update_tasks([
+        Task('renamed', '', first.date, 'Low', 'Pending', identifier=first.id),
+        Task('broken', '', second.date, 'Low', 'Unknown', identifier=second.id),
+        Task('missing', '', second.date, 'Low', 'Pending', identifier=9999),
+    ])
+
+    results = response['results']
+    assert not response['success']
+    assert results[0]['success']
+    assert 'unexpected status' in results[1]['message']
+    assert 'not found' in results[2]['message']
+    assert stored_names(agenda) == ['renamed', 'second']
+    # the cached listing of the day was dropped with the committed rename
+    assert [task.name for task in agenda.find_tasks(day)['tasks']] == ['renamed', 'second']
+
+
+def test_failed_statement_rolls_back_the_whole_transaction(agenda):
+    agenda.add_task('kept', '', make_task('x').date)
+    tasks = [make_task('valid'), Task('invalid', '', make_task('x').date, 'Low', 'Unknown')]
+
+    response = agenda.insert_tasks(tasks)
+
+    assert not response['success']
+    assert stored_names(agenda) == ['kept']
+
+
+def test_add_tasks_reports_every_task_of_a_rolled_back_batch(agenda):
+    response = agenda.add_tasks([make_task('valid'), Task('invalid', '', make_task('x').date, 'Low', 'Unknown')])
+
+    assert [result['success'] for result in response['results']] == [False, False]
+    assert stored_names(agenda) == []
+
+
+def test_nested_transaction_failure_keeps_the_outer_writes(agenda):
+    with agenda.db.transaction():
+        agenda.add_task('outer', '', make_task('x').date)
+        response = agenda.insert_tasks([Task('invalid', '', make_task('x').date, 'Low', 'Unknown')])
+
+    assert not response['success']
+    assert stored_names(agenda) == ['outer']
+
+
+def test_complete_and_delete_tasks_report_missing_ids(agenda):
+    task = agenda.add_task('one', '', make_task('x').date)['task']
+
+    completed = agenda.complete_tasks([task.id, 9999])
+    assert [result['success'] for result in completed['results']] == [True, False]
+    assert agenda.get_task(task.id)['task'].status == 'Completed'
+
+    deleted = agenda.delete_tasks([task.id])
+    assert deleted['success']
+    assert stored_names(agenda) == []
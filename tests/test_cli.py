@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+import cli
+
+
+def run(capsys, db_path: str, *argv: str) -> tuple[int, list[dict], str]:
+    code = cli.main(['--db', db_path, *argv])
+    captured = capsys.readouterr()
+    # every stdout line is JSON, diagnostics go to stderr
+    return code, [json.loads(line) for line in captured.out.splitlines()], captured.err
+
+
+def test_empty_listings_succeed(capsys, tmp_path):
+    db_path = str(tmp_path / 'tasks.db')
+
+    assert run(capsys, db_path, 'list', '--date', '2024-06-01')[:2] == (0, [])
+    assert run(capsys, db_path, 'list', '--search', 'dentist')[:2] == (0, [])
+
+
+def test_unknown_user_is_reported_before_any_write(capsys, tmp_path):
+    db_path = str(tmp_path / 'tasks.db')
+
+    code, lines, _ = run(capsys, db_path, '--user', '7', 'add', 'Dentist')
+    assert code == 1
+    assert 'add-user' in lines[0]['message']
+
+    code, lines, _ = run(capsys, db_path, 'add-user', 'Jane', 'Doe')
+    assert code == 0
+    user_id = lines[0]['user']['id']
+
+    code, lines, _ = run(capsys, db_path, '--user', str(user_id), 'add', 'Dentist', '--date', '2024-06-01 09:00')
+    assert code == 0
+    assert run(capsys, db_path, '--user', str(user_id), 'list', '--date', '2024-06-01')[1][0]['name'] == 'Dentist'
+
+
+def test_database_errors_stay_off_stdout(capsys, tmp_path, monkeypatch):
+    monkeypatch.setenv('TASKMANAGER_DB_SLOW_QUERY_MS', '0')
+    db_path = str(tmp_path / 'tasks.db')
+
+    code, lines, err = run(capsys, db_path, 'add', 'Dentist', '--status', 'Pending', '--rrule', 'FREQ=DAILY')
+    assert code == 0
+    assert lines[0]['task']['rrule'] == 'FREQ=DAILY'
+    assert 'slow query' in err
+
+
+@pytest.mark.parametrize('argv', [
+    ('add', 'Dentist', '--date', 'tomorrow'),
+    ('list', '--date', '2024-13-01'),
+    ('list', '--start', 'June'),
+])
+def test_invalid_dates_are_usage_errors(capsys, tmp_path, argv):
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(['--db', str(tmp_path / 'tasks.db'), *argv])
+    captured = capsys.readouterr()
+
+    assert exit_info.value.code == 2
+    assert captured.out == ''
+    assert 'invalid' in captured.err
@@ -0,0 +1,174 @@
+import os
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from Controllers.agenda_controller import AgendaController
+from Controllers.connection_profile import ConnectionProfile
+from Controllers.context_manager import ContextManager
+from Controllers.query_stats import QueryStats
+
+
+def test_shared_instance_per_resolved_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    first = ContextManager.shared(ConnectionProfile('tasks.db'))
+    try:
+        assert ContextManager.shared(ConnectionProfile(str(tmp_path / 'tasks.db'))) is first
+        assert ContextManager.shared(ConnectionProfile(os.path.join('.', 'x', '..', 'tasks.db'))) is first
+    finally:
+        first.close()
+
+
+def test_shared_rejects_a_different_profile(tmp_path):
+    db_path = str(tmp_path / 'tasks.db')
+    first = ContextManager.shared(ConnectionProfile(db_path))
+    try:
+        assert ContextManager.shared(ConnectionProfile(db_path, {'journal_mode': 'wal'})) is first
+        with pytest.raises(ValueError):
+            ContextManager.shared(ConnectionProfile(db_path, timeout=1.0))
+    finally:
+        first.close()
+
+
+# the tables as created before schema migrations existed
+BASELINE_SCHEMA = """
+    CREATE TABLE users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        first_name TEXT NOT NULL,
+        last_name TEXT NOT NULL
+    );
+    CREATE TABLE tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        description TEXT NULL,
+        date DATETIME NOT NULL,
+        status TEXT NOT NULL CHECK (status IN ('Pending', 'In Progress', 'Completed', 'On Hold', 'Cancelled')),
+        priority TEXT NOT NULL,
+        user_id INTEGER,
+        FOREIGN KEY(user_id) REFERENCES users(id)
+    );
+    INSERT INTO tasks (name, description, date, status, priority, user_id) VALUES
+        ('Review report', 'numbers', '2024-06-01 09:00:00.123456', 'Pending', 'High', 3),
+        ('Call dentist', '', '2024-06-01 10:30:00', 'Completed', 'Critical', 3),
+        ('Groceries', 'milk', '2024-06-02 18:00:00', 'Pending', 'Low', 3);
+"""
+
+
+def indexes(db) -> set[str]:
+    return {name for name, in db.execute("SELECT name FROM sqlite_master WHERE type = 'index'", (), 'all')}
+
+
+def test_new_database_is_created_at_the_latest_version(db):
+    assert db.schema_version() == len(ContextManager.MIGRATIONS)
+    assert {'idx_tasks_user_rank', 'idx_tasks_user_date_rank', 'idx_tasks_user_day_rank'} <= indexes(db)
+
+
+def test_baseline_database_is_migrated_with_its_data(tmp_path):
+    db_path = str(tmp_path / 'old.db')
+    connection = sqlite3.connect(db_path)
+    connection.executescript(BASELINE_SCHEMA)
+    connection.close()
+
+    db = ContextManager(ConnectionProfile(db_path))
+    try:
+        assert db.schema_version() == len(ContextManager.MIGRATIONS)
+        rows = db.execute('SELECT name, date, priority_rank, day, user_id FROM tasks ORDER BY id', (), 'all')
+        # dates normalized and parsed, ranks filled in, the referenced user created
+        assert rows == [
+            ('Review report', datetime(2024, 6, 1, 9), 2, '2024-06-01', 3),
+            ('Call dentist', datetime(2024, 6, 1, 10, 30), 1, '2024-06-01', 3),
+            ('Groceries', datetime(2024, 6, 2, 18), 4, '2024-06-02', 3),
+        ]
+        assert db.execute('SELECT id FROM users WHERE id IN (1, 3) ORDER BY id', (), 'all') == [(1, ), (3, )]
+
+        # tasks stored before the full-text index and the summary table are in both
+        assert AgendaController(3, db).search_tasks('dent')['tasks'][0].name == 'Call dentist'
+        assert db.execute('SELECT day, count FROM task_day_counts ORDER BY day, status', (), 'all') == [
+            ('2024-06-01', 1), ('2024-06-01', 1), ('2024-06-02', 1)
+        ]
+    finally:
+        db.close()
+
+
+def test_migrations_run_once(tmp_path):
+    db_path = str(tmp_path / 'tasks.db')
+    ContextManager(ConnectionProfile(db_path)).close()
+    db = ContextManager(ConnectionProfile(db_path))
+    try:
+        assert db.schema_version() == len(ContextManager.MIGRATIONS)
+        assert db.migrate()
+    finally:
+        db.close()
+
+
+def test_failed_migration_keeps_the_previous_version(tmp_path, monkeypatch):
+    db_path = str(tmp_path / 'tasks.db')
+    ContextManager(ConnectionProfile(db_path)).close()
+
+    broken = ContextManager.MIGRATIONS + (("CREATE TABLE extra (id INTEGER)", "NOT SQL"), )
+    monkeypatch.setattr(ContextManager, 'MIGRATIONS', broken)
+    db = ContextManager(ConnectionProfile(db_path))
+    try:
+        assert db.schema_version() == len(broken) - 1
+        assert db.execute("SELECT name FROM sqlite_master WHERE name = 'extra'", (), 'all') == []
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def timed_db(tmp_path, capsys):
+    # every statement counts as slow, so each one is reported with its plan
+    db = ContextManager(ConnectionProfile(str(tmp_path / 'tasks.db'), slow_query_ms=0))
+    db.query_stats.reset()
+    capsys.readouterr()
+    yield db
+    db.close()
+
+
+def test_latency_histogram_buckets():
+    stats = QueryStats()
+    for elapsed_ms in (0.05, 0.1, 0.3, 7, 2000):
+        stats.record('SELECT   1', elapsed_ms)
+
+    statement = stats.snapshot()['SELECT 1']
+    assert statement['calls'] == 5
+    assert statement['max_ms'] == 2000
+    # a bound belongs to its own bucket, anything past the last bound to the overflow bucket
+    assert {label: calls for label, calls in statement['histogram'].items() if calls} == {
+        '<=0.1ms': 2, '<=0.5ms': 1, '<=10ms': 1, '>1000ms': 1
+    }
+
+
+def test_rows_and_errors_are_counted_per_statement(timed_db, capsys):
+    insert = "INSERT INTO tasks (name, description, date, priority, status, user_id) VALUES (?, '', ?, 'Low', 'Pending', 1)"
+    assert timed_db.execute_many(insert, [(f'task {number}', '2024-06-01 09:00:00') for number in range(3)]) == 3
+    assert len(timed_db.execute("SELECT id FROM tasks WHERE user_id = ?", (1, ), 'all')) == 3
+    assert timed_db.execute("SELECT missing FROM tasks", (), 'all') is False
+
+    snapshot = timed_db.stats_snapshot()
+    assert (snapshot[insert]['calls'], snapshot[insert]['rows']) == (1, 3)
+    assert snapshot["SELECT id FROM tasks WHERE user_id = ?"]['rows'] == 3
+    assert snapshot["SELECT missing FROM tasks"]['errors'] == 1
+
+    captured = capsys.readouterr()
+    assert captured.out == ''
+    assert 'SQLite execution error' in captured.err
+
+
+def test_slow_queries_are_reported_with_their_plan(timed_db, capsys):
+    timed_db.execute("SELECT id FROM tasks WHERE user_id = ? AND day = ?", (1, '2024-06-01'), 'all')
+
+    captured = capsys.readouterr()
+    assert captured.out == ''
+    report = captured.err.splitlines()
+    assert report[0].startswith('SQLite slow query') and report[0].endswith('WHERE user_id = ? AND day = ?')
+    assert any('idx_tasks_user_day_rank' in line for line in report[1:])
+
+
+def test_stats_are_off_by_default(db, capsys):
+    db.execute("SELECT 1", (), 'all')
+
+    assert db.query_stats is None
+    assert db.stats_snapshot() == {}
+    assert capsys.readouterr().err == ''
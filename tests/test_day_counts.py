@@ -0,0 +1,72 @@
+import random
+from datetime import datetime, timedelta
+
+from Models.task import Task
+
+SUMMARY = 'SELECT user_id, day, status, priority, count FROM task_day_counts ORDER BY 1, 2, 3, 4'
+# the summary covers single tasks, series are expanded by day_counts
+GROUPED = """
+    SELECT user_id, substr(date, 1, 10), status, priority, COUNT(*) FROM tasks
+    WHERE user_id IS NOT NULL AND rrule IS NULL
+    GROUP BY 1, 2, 3, 4 ORDER BY 1, 2, 3, 4
+"""
+
+
+def assert_consistent(db):
+    assert db.execute(SUMMARY, (), 'all') == db.execute(GROUPED, (), 'all')
+
+
+def test_summary_follows_random_inserts_updates_and_deletes(agenda, db):
+    rng = random.Random(7)
+    start = datetime(2024, 6, 1)
+
+    def random_task(name: str, identifier: int | None = None) -> Task:
+        return Task(
+            name, '', start + timedelta(days=rng.randrange(5), hours=rng.randrange(24)),
+            rng.choice(Task.priorities()), rng.choice(Task.statuses()), identifier=identifier
+        )
+
+    agenda.add_tasks(random_task(f'task {number}') for number in range(60))
+    assert_consistent(db)
+
+    for _ in range(200):
+        task_ids = [task_id for task_id, in db.execute('SELECT id FROM tasks', (), 'all')]
+        task_id = rng.choice(task_ids)
+        action = rng.randrange(5)
+        if action == 0:
+            agenda.delete_task(task_id)
+        elif action == 1:
+            agenda.set_as_completed(task_id)
+        elif action == 2:
+            agenda.update_tasks([random_task('bulk', task_id) for task_id in rng.sample(task_ids, 5)])
+        elif action == 3:
+            agenda.add_task('new', '', start + timedelta(days=rng.randrange(5)))
+        else:
+            moved = random_task('moved')
+            agenda.update_task(task_id, moved.name, '', moved.date, moved.priority, moved.status)
+        assert_consistent(db)
+
+
+def test_series_are_left_out_of_the_summary(agenda, db):
+    task = agenda.add_task('single', '', datetime(2024, 6, 1, 9))['task']
+    agenda.add_task('daily', '', datetime(2024, 6, 1, 9), rrule='FREQ=DAILY;COUNT=3')
+    assert_consistent(db)
+
+    # a single task made recurring leaves the summary, and comes back without its rule
+    agenda.set_recurrence(task.id, 'FREQ=WEEKLY')
+    assert db.execute(SUMMARY, (), 'all') == []
+    agenda.set_recurrence(task.id, None)
+    assert_consistent(db)
+    assert len(db.execute(SUMMARY, (), 'all')) == 1
+
+
+def test_day_counts_add_expanded_occurrences(agenda):
+    agenda.add_task('single', '', datetime(2024, 6, 1, 9), 'High', 'Completed')
+    agenda.add_task('daily', '', datetime(2024, 6, 1, 9), 'Low', 'Pending', 'FREQ=DAILY;COUNT=3')
+
+    days = agenda.day_counts('2024-06-01', '2024-06-05')['days']
+
+    assert sorted(days) == ['2024-06-01', '2024-06-02', '2024-06-03']
+    assert days['2024-06-01']['total'] == 2
+    assert days['2024-06-01']['open'] == 1
+    assert days['2024-06-02']['statuses'] == {'Pending': 1}
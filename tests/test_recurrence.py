@@ -0,0 +1,152 @@
+from datetime import datetime
+
+import time
+from datetime import timedelta
+
+import pytest
+
+from Controllers import queries, recurrence
+from Controllers.task_filter import TaskFilter
+from Models.task import Task
+
+JUNE = TaskFilter(start=datetime(2024, 6, 1), end=datetime(2024, 7, 1))
+
+
+def listed(agenda, task_filter: TaskFilter) -> list[tuple[str, datetime]]:
+    return [(task.name, task.get_datetime()) for task in agenda.find_tasks(task_filter)['tasks']]
+
+
+def add_series(agenda, rule: str, name: str = 'standup', start: datetime = datetime(2024, 6, 3, 9)) -> int:
+    response = agenda.add_task(name, '', start, rrule=rule)
+    assert response['success']
+    return response['task'].id
+
+
+def test_series_is_expanded_in_bounded_listings(agenda):
+    add_series(agenda, 'FREQ=WEEKLY;COUNT=3')
+    agenda.add_task('dentist', '', datetime(2024, 6, 10, 8))
+
+    assert listed(agenda, JUNE) == [
+        ('standup', datetime(2024, 6, 3, 9)),
+        ('dentist', datetime(2024, 6, 10, 8)),
+        ('standup', datetime(2024, 6, 10, 9)),
+        ('standup', datetime(2024, 6, 17, 9)),
+    ]
+    assert listed(agenda, TaskFilter.for_day('2024-06-24')) == []
+    # unbounded listings show a series once
+    assert listed(agenda, TaskFilter()) == [('standup', datetime(2024, 6, 3, 9)), ('dentist', datetime(2024, 6, 10, 8))]
+
+
+def test_overrides_change_a_single_occurrence(agenda):
+    task_id = add_series(agenda, 'FREQ=DAILY;COUNT=5')
+
+    assert agenda.update_occurrence(task_id, datetime(2024, 6, 4, 9), name='retro')['success']
+    assert agenda.update_occurrence(task_id, datetime(2024, 6, 5, 9), date=datetime(2024, 6, 20, 14))['success']
+    assert agenda.complete_occurrence(task_id, datetime(2024, 6, 6, 9))['success']
+    assert not agenda.update_occurrence(task_id, datetime(2024, 6, 4, 10), name='off schedule')['success']
+
+    assert listed(agenda, TaskFilter(statuses=TaskFilter.ACTIVE_STATUSES, start=JUNE.start, end=JUNE.end)) == [
+        ('standup', datetime(2024, 6, 3, 9)),
+        ('retro', datetime(2024, 6, 4, 9)),
+        ('standup', datetime(2024, 6, 7, 9)),
+        ('standup', datetime(2024, 6, 20, 14)),
+    ]
+    # moved out of its own day, into another one
+    assert listed(agenda, TaskFilter.for_day('2024-06-05')) == []
+    assert listed(agenda, TaskFilter.for_day('2024-06-20')) == [('standup', datetime(2024, 6, 20, 14))]
+
+
+@pytest.mark.parametrize('rule, expected', [
+    ('FREQ=DAILY', None),
+    ('FREQ=DAILY;COUNT=3', datetime(2024, 6, 5, 9)),
+    ('FREQ=WEEKLY;UNTIL=20240620T000000Z', datetime(2024, 6, 17, 9)),
+    ('FREQ=DAILY;UNTIL=20240101', datetime(2024, 6, 3, 9)),
+    # too long to expand, bounded by UNTIL or by the occurrences that are expanded
+    ('FREQ=SECONDLY;UNTIL=21000101T000000', datetime(2100, 1, 1)),
+    ('FREQ=SECONDLY;COUNT=1000000000', datetime(2024, 6, 3, 9) + timedelta(seconds=recurrence.MAX_OCCURRENCES - 1)),
+])
+def test_series_end(rule, expected):
+    assert recurrence.series_end(rule, datetime(2024, 6, 3, 9)) == expected
+
+
+def test_ended_series_is_not_expanded(agenda):
+    add_series(agenda, 'FREQ=DAILY;UNTIL=20240605T090000')
+    add_series(agenda, 'FREQ=SECONDLY;UNTIL=21000101T000000', name='ticker', start=datetime(2024, 6, 30, 23, 59, 58))
+
+    assert listed(agenda, TaskFilter(start=datetime(2024, 6, 10), end=datetime(2024, 7, 1))) == [
+        ('ticker', datetime(2024, 6, 30, 23, 59, 58)),
+        ('ticker', datetime(2024, 6, 30, 23, 59, 59)),
+    ]
+
+
+@pytest.mark.parametrize('rule', [
+    'FREQ=HOURLY;INTERVAL=5',
+    'FREQ=DAILY;INTERVAL=3;BYHOUR=8,17',
+    'FREQ=WEEKLY;INTERVAL=2;BYDAY=TU,SU;WKST=SU',
+    'FREQ=MONTHLY;BYMONTHDAY=1,15,31',
+    'FREQ=MONTHLY;INTERVAL=5',
+    'FREQ=YEARLY;INTERVAL=3',
+])
+def test_old_series_are_expanded_from_the_range(rule):
+    # started on a 31st in a leap year, years before the range
+    start = datetime(2016, 1, 31, 9, 17, 5)
+    range_start, range_end = datetime(2024, 6, 1), datetime(2027, 6, 1)
+
+    expected = []
+    for occurrence in recurrence.parse_rule(rule, start).xafter(range_start, inc=True):
+        if occurrence >= range_end or len(expected) == recurrence.MAX_OCCURRENCES:
+            break
+        expected.append(occurrence)
+
+    assert list(recurrence.occurrences(rule, start, range_start, range_end)) == expected
+    assert all(recurrence.is_occurrence(rule, start, occurrence) for occurrence in expected[:50])
+    assert not recurrence.is_occurrence(rule, start, expected[0] + timedelta(seconds=1))
+
+
+def test_old_minutely_series_does_not_walk_from_its_start():
+    start = datetime(2016, 3, 4, 9)
+
+    began = time.perf_counter()
+    day = list(recurrence.occurrences('FREQ=MINUTELY', start, datetime(2024, 6, 1), datetime(2024, 6, 2)))
+
+    # about 4.4 million minutes lie between the start and the range
+    assert len(day) == 1440
+    assert time.perf_counter() - began < 1
+
+
+def test_changing_a_moved_occurrence_refreshes_the_day_it_was_moved_to(agenda):
+    task_id = add_series(agenda, 'FREQ=DAILY;COUNT=5')
+    june_20 = TaskFilter.for_day('2024-06-20')
+    agenda.update_occurrence(task_id, datetime(2024, 6, 5, 9), date=datetime(2024, 6, 20, 14))
+    assert [task.status for task in agenda.find_tasks(june_20)['tasks']] == ['Pending']
+
+    assert agenda.complete_occurrence(task_id, datetime(2024, 6, 5, 9))['success']
+    assert [task.status for task in agenda.find_tasks(june_20)['tasks']] == ['Completed']
+
+    # moved on again, gone from the day it was moved to before
+    assert agenda.update_occurrence(task_id, datetime(2024, 6, 5, 9), date=datetime(2024, 6, 21, 8))['success']
+    assert agenda.find_tasks(june_20)['tasks'] == []
+
+
+def test_bulk_update_moves_the_end_of_a_counted_series(agenda):
+    task_id = add_series(agenda, 'FREQ=WEEKLY;COUNT=3')
+    series = agenda.get_task(task_id)['task']
+    moved = Task(series.name, series.description, datetime(2024, 7, 1, 9), 'Low', series.status, identifier=task_id)
+
+    assert agenda.update_tasks([moved])['success']
+
+    july = TaskFilter(start=datetime(2024, 7, 1), end=datetime(2024, 8, 1))
+    assert [date for _, date in listed(agenda, july)] == [datetime(2024, 7, 1, 9), datetime(2024, 7, 8, 9), datetime(2024, 7, 15, 9)]
+    assert listed(agenda, JUNE) == []
+
+
+def test_series_query_finds_moved_occurrences_by_index(db):
+    plan = db.execute(
+        'EXPLAIN QUERY PLAN ' + queries.SELECT_SERIES.sql,
+        (1, datetime(2024, 7, 1), datetime(2024, 6, 1), datetime(2024, 6, 1), datetime(2024, 7, 1)),
+        'all'
+    )
+    details = [row[3] for row in plan]
+
+    assert any('idx_task_occurrences_date' in detail for detail in details)
+    assert not any(detail.startswith('SCAN') for detail in details)
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+from itertools import chain, repeat
+
+import pytest
+
+pytest.importorskip('PySide6')
+
+from PySide6.QtCore import QCoreApplication
+from PySide6.QtTest import QTest
+
+from Views.reminder_scheduler import ReminderScheduler
+
+
+class InlineLoader:
+    # runs submitted calls right away, in place of the worker thread
+    def submit(self, channel, function, *args, callback=None, **kwargs):
+        result = function(*args, **kwargs)
+        if callback is not None:
+            callback(result)
+
+
+@pytest.fixture
+def scheduler(agenda):
+    app = QCoreApplication.instance() or QCoreApplication([])
+    shown = []
+    scheduler = ReminderScheduler(agenda, InlineLoader(), shown.append, parent=app)
+    yield scheduler, shown
+    scheduler.deleteLater()
+
+
+def test_empty_horizon_is_not_an_error(scheduler, capsys):
+    scheduler, _ = scheduler
+    scheduler.reload()
+
+    assert scheduler.pending() == []
+    assert capsys.readouterr().out == ''
+
+
+def test_due_tasks_are_read_past_the_cache(scheduler, agenda):
+    scheduler, _ = scheduler
+    soon = datetime.now().replace(microsecond=0) + timedelta(minutes=5)
+    agenda.add_task('Soon', '', soon)
+    agenda.add_task('Series', '', soon, rrule='FREQ=DAILY')
+    agenda.add_task('Tomorrow', '', soon + timedelta(days=1))
+
+    scheduler.reload()
+
+    assert sorted(task.name for task in scheduler.pending()) == ['Series', 'Soon']
+    assert agenda.cache.stats()['size'] == 0
+
+
+def test_task_due_on_a_window_boundary_is_announced(agenda, monkeypatch):
+    # the first window is loaded at 10:00:00.4, every later call to now() is past its end
+    first = datetime(2024, 6, 1, 10, 0, 0, 400000)
+    clock = chain([first, first], repeat(datetime(2024, 6, 1, 11, 0, 0, 700000)))
+
+    class Clock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return next(clock)
+
+    monkeypatch.setattr('Views.reminder_scheduler.datetime', Clock)
+    boundary = agenda.add_task('On the hour', '', datetime(2024, 6, 1, 11), 'Low')['task']
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    shown = []
+    scheduler = ReminderScheduler(agenda, InlineLoader(), shown.append, parent=app)
+    scheduler.reload()
+    # left out of the first window, loaded and announced by the next one
+    assert scheduler.pending() == []
+
+    for _ in range(3):
+        QTest.qWait(20)
+    scheduler.deleteLater()
+
+    assert [task.id for task in shown] == [boundary.id]
@@ -0,0 +1,67 @@
+from datetime import datetime
+
+from conftest import make_task
+from Controllers.agenda_controller import AgendaController
+
+
+def found(agenda, query: str) -> list[str]:
+    response = agenda.search_tasks(query)
+    assert response['success']
+    return [task.name for task in response['tasks']]
+
+
+def test_other_users_matches_do_not_use_up_the_candidates(agenda, db):
+    db.execute("INSERT INTO users (id, first_name, last_name) VALUES (2, 'Other', 'User')")
+    other = AgendaController(2, db)
+    other.add_task('Review contract', '', datetime(2024, 6, 1))
+    # newer matches of user 1, more than the candidates ranked per search
+    agenda.insert_tasks(make_task(f'Review {number}') for number in range(AgendaController.SEARCH_CANDIDATES + 500))
+
+    assert found(other, 'review') == ['Review contract']
+    assert len(found(agenda, 'review')) == 50
+
+
+def test_index_follows_inserts_updates_and_deletes(agenda):
+    task = agenda.add_task('Call the dentist', 'Book a cleaning', datetime(2024, 6, 1, 9))['task']
+    assert found(agenda, 'dent') == ['Call the dentist']
+    assert found(agenda, 'cleaning') == ['Call the dentist']
+
+    agenda.update_task(task.id, 'Call the plumber', 'Kitchen sink', task.date, 'Low', 'Pending')
+    assert found(agenda, 'dentist') == []
+    assert found(agenda, 'plumb sink') == ['Call the plumber']
+
+    agenda.delete_task(task.id)
+    assert found(agenda, 'plumber') == []
+
+
+def test_bulk_writes_are_indexed(agenda):
+    agenda.db.execute_many(
+        "INSERT INTO tasks (name, description, date, priority, status, user_id) VALUES (?, '', ?, 'Low', 'Pending', 1)",
+        [(f'Invoice {number}', datetime(2024, 6, 1)) for number in range(3)]
+    )
+    assert len(found(agenda, 'invoice')) == 3
+
+    agenda.delete_tasks([task_id for task_id, in agenda.db.execute('SELECT id FROM tasks', (), 'all')])
+    assert found(agenda, 'invoice') == []
+
+
+def test_search_is_limited_to_the_user(agenda, db):
+    db.execute("INSERT INTO users (id, first_name, last_name) VALUES (2, 'Other', 'User')")
+    AgendaController(2, db).add_task('Dentist of user two', '', datetime(2024, 6, 1))
+    agenda.add_task('Dentist of user one', '', datetime(2024, 6, 1))
+
+    assert found(agenda, 'dentist') == ['Dentist of user one']
+
+
+def test_best_matches_come_first(agenda):
+    agenda.add_task('Report', 'about the garden', datetime(2024, 6, 1))
+    agenda.add_task('Garden garden', 'garden work in the garden', datetime(2024, 6, 1))
+
+    assert found(agenda, 'garden')[0] == 'Garden garden'
+
+
+def test_operators_in_the_query_are_plain_words(agenda):
+    agenda.add_task('Cats AND dogs', '', datetime(2024, 6, 1))
+
+    assert found(agenda, 'AND') == ['Cats AND dogs']
+    assert found(agenda, '"') == []
@@ -0,0 +1,50 @@
+from datetime import datetime
+
+import pytest
+
+from Controllers.task_filter import TaskFilter
+from Models.task import Task
+
+TASKS = [
+    ('Review report', 'quarterly numbers'),
+    ('Call the dentist', 'ask about the 12th'),
+    ('Café meeting', 'bring the slides'),
+    ('Reply to e-mail', 'about_the report'),
+    ('Groceries', ''),
+]
+
+
+@pytest.fixture
+def stored(agenda) -> list[Task]:
+    for name, description in TASKS:
+        agenda.add_task(name, description, datetime(2024, 6, 1, 9))
+    return agenda.get_tasks_page(None, None, 100)['tasks']
+
+
+@pytest.mark.parametrize('text', ['re', 'report', 'REPORT', 'cafe', 'dentist 12', 'the', 'port', 'e-mail', 'zzz', '%'])
+def test_text_condition_and_matches_agree(agenda, stored, text):
+    task_filter = TaskFilter(text=text)
+    response = agenda.get_tasks_page(task_filter, None, 100)
+
+    assert response['success']
+    assert sorted(task.id for task in response['tasks']) == sorted(task.id for task in stored if task_filter.matches(task))
+    assert agenda.count_tasks(task_filter) == len(response['tasks'])
+
+
+def test_text_matches_word_prefixes(stored):
+    names = [task.name for task in stored if TaskFilter(text='re').matches(task)]
+    assert sorted(names) == ['Reply to e-mail', 'Review report']
+
+
+def test_one_day_filter_uses_the_day_column():
+    conditions, params = TaskFilter.for_day('2024-06-01').conditions()
+    assert conditions == ('day = ?', )
+    assert params == ('2024-06-01', )
+
+    conditions, _ = TaskFilter(start=datetime(2024, 6, 1), end=datetime(2024, 6, 3)).conditions()
+    assert conditions == ('date >= ?', 'date < ?')
+
+
+def test_conditions_are_built_once():
+    task_filter = TaskFilter(statuses=['Pending'], text='report')
+    assert task_filter.conditions() is task_filter.conditions()
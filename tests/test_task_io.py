@@ -0,0 +1,74 @@
+import io
+import json
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from Controllers.task_filter import TaskFilter
+from Controllers.task_io import import_tasks, read_records
+from Models.task import Task
+
+
+def jsonl(*records: dict) -> io.StringIO:
+    return io.StringIO(''.join(json.dumps(record) + '\n' for record in records))
+
+
+def stored_names(agenda) -> list[str]:
+    return sorted(task.name for task in agenda.find_tasks(TaskFilter())['tasks'])
+
+
+def test_import_counts_inserted_and_rejected_records(agenda):
+    errors = []
+    stream = jsonl(
+        {'name': 'one', 'date': '2024-06-01 09:00:00'},
+        {'name': '', 'date': '2024-06-01 10:00:00'},
+        {'name': 'two', 'date': '2024-06-02 09:00:00', 'priority': 'High'},
+        {'name': 'daily', 'date': '2024-06-03 09:00:00', 'rrule': 'FREQ=NOPE'}
+    )
+
+    result = import_tasks(agenda, read_records(stream, 'jsonl'), chunk_size=2, on_error=errors.append)
+
+    assert (result['imported'], result['failed']) == (2, 2)
+    assert [error['line'] for error in errors] == [2, 4]
+    assert stored_names(agenda) == ['one', 'two']
+
+
+def test_failed_chunk_is_rolled_back_and_counted(agenda, db):
+    db.execute(
+        "CREATE TRIGGER reject_boom BEFORE INSERT ON tasks WHEN NEW.name = 'boom' "
+        "BEGIN SELECT RAISE(ABORT, 'boom rejected'); END"
+    )
+    errors = []
+    stream = jsonl(*({'name': name} for name in ('one', 'two', 'boom', 'three')))
+
+    result = import_tasks(agenda, read_records(stream, 'jsonl'), chunk_size=2, on_error=errors.append)
+
+    # the second chunk failed as a whole, the first one stays
+    assert (result['success'], result['imported'], result['failed']) == (False, 2, 2)
+    assert errors[0]['lines'] == [3, 4]
+    assert stored_names(agenda) == ['one', 'two']
+
+
+@pytest.fixture
+def berlin_time(monkeypatch):
+    # local time two hours ahead of UTC in June
+    monkeypatch.setenv('TZ', 'Europe/Berlin')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_dates_with_an_offset_are_stored_as_local_time(agenda, berlin_time):
+    aware = datetime(2024, 6, 1, 9, 0, tzinfo=timezone.utc)
+    local = aware.astimezone().replace(tzinfo=None)
+
+    task = Task.from_dict({'name': 'call', 'date': aware.isoformat()})
+    assert task.get_datetime() == local
+    assert task.get_datetime().tzinfo is None
+
+    import_tasks(agenda, read_records(jsonl({'name': 'call', 'date': '2024-06-01T09:00:00+00:00'}), 'jsonl'))
+    stored = agenda.find_tasks(TaskFilter.for_day(local.strftime('%Y-%m-%d')))['tasks']
+    assert [task.get_datetime() for task in stored] == [local]
+    assert local == datetime(2024, 6, 1, 11, 0)